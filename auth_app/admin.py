@@ -2,7 +2,16 @@
 
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
-from .models import User
+from garage_ari_project.paginators import ApproxCountPaginator
+from .models import User, EmployeeProfile
+
+
+class EmployeeProfileInline(admin.StackedInline):
+    """HR details are stored on EmployeeProfile; edit them on the user page."""
+    model = EmployeeProfile
+    can_delete = False
+    extra = 0
+
 
 @admin.register(User)
 class CustomUserAdmin(UserAdmin):
@@ -11,10 +20,19 @@ class CustomUserAdmin(UserAdmin):
     Overrides Django's default UserAdmin to use 'email' as the main identifier.
     """
     # Fields to display in the list view
-    list_display = ('email', 'username', 'first_name', 'last_name', 'is_staff')
+    list_display = ('email', 'username', 'first_name', 'last_name', 'supervisor_email', 'is_staff')
+    
+    # JOIN the supervisor in the changelist query instead of one query per row
+    list_select_related = ('supervisor',)
     
-    # Fields to use for searching
-    search_fields = ('email', 'username', 'first_name', 'last_name')
+    # Avoid COUNT(*) scans of the user table on every changelist page
+    paginator = ApproxCountPaginator
+    show_full_result_count = False
+    list_per_page = 50
+    
+    # Fields to use for searching: prefix (istartswith) and exact lookups only,
+    # so the B-tree indexes can be used instead of a full-table icontains scan.
+    search_fields = ('^email', '^first_name', '^last_name', '=employee_id')
     
     # Custom field sets for the detail view
     fieldsets = (
@@ -26,9 +44,16 @@ class CustomUserAdmin(UserAdmin):
         ('Dates', {'fields': ('last_login', 'date_joined')}),
     )
     
+    inlines = [EmployeeProfileInline]
+    
     # Ensures 'email' is used as the login field in the admin form
     ordering = ('email',)
     
-    # These two lines remove the default username field from display/editing, 
-    # but the model still requires it due to AbstractUser inheritance.
-    filter_horizontal = ('groups', 'user_permissions',)
\ No newline at end of file
+    # Render related objects as ID inputs instead of loading every Group,
+    # Permission and User row into <select> widgets on each change form.
+    filter_horizontal = ()
+    raw_id_fields = ('groups', 'user_permissions', 'supervisor')
+
+    @admin.display(description='Supervisor', ordering='supervisor__email')
+    def supervisor_email(self, obj):
+        return obj.supervisor.email if obj.supervisor_id else ''
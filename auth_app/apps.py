@@ -4,3 +4,9 @@ from django.apps import AppConfig
 class AuthAppConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'auth_app'
+
+    def ready(self):
+        """
+        Registers the signal handlers that keep the cached JWT user in sync.
+        """
+        import auth_app.signals
@@ -0,0 +1,113 @@
+# auth_app/authentication.py
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from django.core.cache import cache
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+from .cache import USER_CACHE_ENABLED, USER_CACHE_TIMEOUT, user_cache_key, user_cache_version
+
+# Columns needed to authenticate, check permissions and render the /users/me/
+# profile. The HR/salary/education columns are left out of the per-request SELECT.
+AUTH_USER_FIELDS = (
+    'id', 'password', 'email', 'first_name', 'last_name', 'avatar',
+    'is_active', 'is_staff', 'is_superuser', 'is_employee', 'role',
+)
+
+# Verified access tokens are remembered in-process for this long (seconds), so
+# a burst of requests with the same token checks the signature once. Kept short
+# to bound how long a token outlives its expiry by at most a few seconds.
+TOKEN_CACHE_TIMEOUT = 5
+TOKEN_CACHE_MAXSIZE = 10000
+
+
+class _ValidatedTokenCache:
+    """
+    Bounded LRU of sha256(raw token) -> (validated token, deadline). The digest
+    is stored instead of the token itself.
+    """
+    def __init__(self, maxsize, timeout):
+        self.maxsize = maxsize
+        self.timeout = timeout
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[1] <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def set(self, key, validated_token):
+        now = time.monotonic()
+        deadline = now + self.timeout
+        exp = validated_token.get('exp')
+        if exp is not None:
+            # Never serve a token past its own expiry
+            deadline = min(deadline, now + (exp - time.time()))
+        with self._lock:
+            self._entries[key] = (validated_token, deadline)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+
+_validated_tokens = _ValidatedTokenCache(TOKEN_CACHE_MAXSIZE, TOKEN_CACHE_TIMEOUT)
+
+
+class CustomJWTAuthentication(JWTAuthentication):
+    """
+    JWT authentication that loads request.user with only AUTH_USER_FIELDS
+    instead of the full-width User row, and (with a shared cache) caches it so
+    repeat requests with the same token skip the database. Signature checks are likewise
+    reused for TOKEN_CACHE_TIMEOUT seconds per token.
+    """
+    def get_validated_token(self, raw_token):
+        key = hashlib.sha256(raw_token).digest()
+        validated_token = _validated_tokens.get(key)
+        if validated_token is None:
+            validated_token = super().get_validated_token(raw_token)
+            _validated_tokens.set(key, validated_token)
+        return validated_token
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+        # Writes to the user bump its version, which retires this entry (see auth_app/cache.py)
+        cache_key = user_cache_key(user_id, user_cache_version(user_id)) if USER_CACHE_ENABLED else None
+        user = cache.get(cache_key) if cache_key else None
+        if user is None:
+            try:
+                user = self.user_model.objects.only(*AUTH_USER_FIELDS).get(
+                    **{api_settings.USER_ID_FIELD: user_id}
+                )
+            except self.user_model.DoesNotExist:
+                raise AuthenticationFailed(_("User not found"), code="user_not_found")
+            if cache_key:
+                cache.set(cache_key, user, USER_CACHE_TIMEOUT)
+
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        if api_settings.CHECK_REVOKE_TOKEN:
+            if validated_token.get(api_settings.REVOKE_TOKEN_CLAIM) != get_md5_hash_password(user.password):
+                raise AuthenticationFailed(
+                    _("The user's password has been changed."), code="password_changed"
+                )
+
+        return user
@@ -0,0 +1,58 @@
+# auth_app/cache.py
+
+from uuid import uuid4
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+# The authenticated user (CustomJWTAuthentication) and the /user/ payload
+# (UserView) are only cached when the cache is shared by all workers (REDIS_URL).
+# With the per-process local-memory cache an eviction would only reach the
+# process that made the write, so other workers could keep a deactivated user
+# or an old role for the whole timeout.
+USER_CACHE_ENABLED = bool(getattr(settings, 'REDIS_URL', None))
+
+# Cached entries live this long (seconds) unless the user's version moves first.
+USER_CACHE_TIMEOUT = 300
+
+
+def _version_key(user_id):
+    return f'user-version:{user_id}'
+
+
+def user_cache_version(user_id):
+    """
+    The user's current cache version; part of every per-user key, so bumping it
+    orphans all of that user's entries at once. A missing version gets a fresh
+    random one (never a reused value), so an evicted version can't revive old entries.
+    """
+    version = cache.get(_version_key(user_id))
+    if version is None:
+        version = uuid4().hex
+        cache.add(_version_key(user_id), version, None)
+        version = cache.get(_version_key(user_id), version)
+    return version
+
+
+def bump_user_cache_version(*user_ids):
+    """
+    Invalidates the users' cached entries once the current transaction commits.
+    Bumping after the commit means a request that read the old row before then
+    can only have stored it under the abandoned version.
+    """
+    if not USER_CACHE_ENABLED or not user_ids:
+        return
+
+    def bump():
+        cache.set_many({_version_key(user_id): uuid4().hex for user_id in user_ids}, None)
+
+    transaction.on_commit(bump)
+
+
+def user_cache_key(user_id, version):
+    return f'jwt:user:{user_id}:{version}'
+
+
+def profile_cache_key(user_id, version):
+    return f'me:{user_id}:{version}'
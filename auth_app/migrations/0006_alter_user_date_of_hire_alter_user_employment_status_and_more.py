@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-15 21:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth_app', '0005_user_allowances_user_bank_account_number_and_more'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='user',
+            name='date_of_hire',
+            field=models.DateField(blank=True, db_index=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='user',
+            name='employment_status',
+            field=models.CharField(blank=True, choices=[('active', 'Active'), ('on_leave', 'On Leave'), ('suspended', 'Suspended'), ('terminated', 'Terminated')], db_index=True, default='active', max_length=20, null=True),
+        ),
+        migrations.AlterField(
+            model_name='user',
+            name='is_employee',
+            field=models.BooleanField(db_index=True, default=False, help_text='Designates whether the user is considered shop personnel.'),
+        ),
+        migrations.AlterField(
+            model_name='user',
+            name='role',
+            field=models.CharField(choices=[('owner', 'Owner / Administrator'), ('manager', 'Shop Manager'), ('service_advisor', 'Service Advisor'), ('mechanic', 'Technician / Mechanic'), ('customer', 'Customer Account (Non-Employee)')], db_index=True, default='customer', max_length=30, verbose_name='User Role'),
+        ),
+    ]
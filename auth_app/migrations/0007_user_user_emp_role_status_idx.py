@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-15 21:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('auth_app', '0006_alter_user_date_of_hire_alter_user_employment_status_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(fields=['is_employee', 'role', 'employment_status'], name='user_emp_role_status_idx'),
+        ),
+    ]
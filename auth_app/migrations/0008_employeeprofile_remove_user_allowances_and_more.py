@@ -0,0 +1,242 @@
+# Generated by Django 5.2.18 on 2026-10-15 21:29
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+PROFILE_FIELDS = [
+    'middle_name', 'gender', 'date_of_birth', 'nationality', 'marital_status',
+    'national_id', 'tin_number', 'phone_number', 'residential_address', 'postal_address',
+    'emergency_contact_name', 'emergency_contact_phone', 'emergency_relationship',
+    'job_title', 'department', 'division', 'grade', 'employment_type', 'date_of_hire',
+    'contract_start_date', 'contract_end_date', 'work_location',
+    'basic_salary', 'allowances', 'deductions', 'currency',
+    'bank_name', 'bank_account_number', 'payment_method', 'nssf_number', 'nhif_number',
+    'highest_education', 'institution_name', 'field_of_study', 'graduation_year',
+    'professional_certifications', 'skills', 'languages',
+]
+
+
+def copy_hr_fields_to_profile(apps, schema_editor):
+    """Moves the HR columns of every employee into its new EmployeeProfile row."""
+    User = apps.get_model('auth_app', 'User')
+    EmployeeProfile = apps.get_model('auth_app', 'EmployeeProfile')
+    profiles = [
+        EmployeeProfile(user_id=row.pop('id'), **row)
+        for row in User.objects.filter(is_employee=True).values('id', *PROFILE_FIELDS).iterator()
+    ]
+    EmployeeProfile.objects.bulk_create(profiles, batch_size=500)
+
+
+def copy_profile_to_hr_fields(apps, schema_editor):
+    User = apps.get_model('auth_app', 'User')
+    EmployeeProfile = apps.get_model('auth_app', 'EmployeeProfile')
+    for row in EmployeeProfile.objects.values('user_id', *PROFILE_FIELDS).iterator():
+        User.objects.filter(pk=row.pop('user_id')).update(**row)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth_app', '0007_user_user_emp_role_status_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EmployeeProfile',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='employee_profile', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('middle_name', models.CharField(blank=True, max_length=50, null=True)),
+                ('gender', models.CharField(blank=True, max_length=10, null=True)),
+                ('date_of_birth', models.DateField(blank=True, null=True)),
+                ('nationality', models.CharField(blank=True, max_length=50, null=True)),
+                ('marital_status', models.CharField(blank=True, max_length=20, null=True)),
+                ('national_id', models.CharField(blank=True, max_length=50, null=True, unique=True, verbose_name='National ID/Passport')),
+                ('tin_number', models.CharField(blank=True, max_length=50, null=True, verbose_name='TIN')),
+                ('phone_number', models.CharField(blank=True, max_length=20, null=True)),
+                ('residential_address', models.TextField(blank=True, null=True)),
+                ('postal_address', models.TextField(blank=True, null=True)),
+                ('emergency_contact_name', models.CharField(blank=True, max_length=100, null=True)),
+                ('emergency_contact_phone', models.CharField(blank=True, max_length=20, null=True)),
+                ('emergency_relationship', models.CharField(blank=True, max_length=50, null=True)),
+                ('job_title', models.CharField(blank=True, max_length=100, null=True)),
+                ('department', models.CharField(blank=True, max_length=50, null=True)),
+                ('division', models.CharField(blank=True, max_length=50, null=True)),
+                ('grade', models.CharField(blank=True, max_length=50, null=True)),
+                ('employment_type', models.CharField(blank=True, max_length=20, null=True)),
+                ('date_of_hire', models.DateField(blank=True, db_index=True, null=True)),
+                ('contract_start_date', models.DateField(blank=True, null=True)),
+                ('contract_end_date', models.DateField(blank=True, null=True)),
+                ('work_location', models.CharField(blank=True, max_length=100, null=True)),
+                ('basic_salary', models.DecimalField(blank=True, decimal_places=2, max_digits=10, null=True)),
+                ('allowances', models.DecimalField(blank=True, decimal_places=2, max_digits=10, null=True)),
+                ('deductions', models.DecimalField(blank=True, decimal_places=2, max_digits=10, null=True)),
+                ('currency', models.CharField(default='USD', max_length=5)),
+                ('bank_name', models.CharField(blank=True, max_length=100, null=True)),
+                ('bank_account_number', models.CharField(blank=True, max_length=50, null=True)),
+                ('payment_method', models.CharField(blank=True, max_length=50, null=True)),
+                ('nssf_number', models.CharField(blank=True, max_length=50, null=True)),
+                ('nhif_number', models.CharField(blank=True, max_length=50, null=True)),
+                ('highest_education', models.CharField(blank=True, max_length=50, null=True)),
+                ('institution_name', models.CharField(blank=True, max_length=150, null=True)),
+                ('field_of_study', models.CharField(blank=True, max_length=100, null=True)),
+                ('graduation_year', models.IntegerField(blank=True, null=True)),
+                ('professional_certifications', models.TextField(blank=True, null=True)),
+                ('skills', models.TextField(blank=True, null=True)),
+                ('languages', models.CharField(blank=True, max_length=255, null=True)),
+            ],
+        ),
+        migrations.RunPython(copy_hr_fields_to_profile, copy_profile_to_hr_fields),
+        migrations.RemoveField(
+            model_name='user',
+            name='allowances',
+        ),
+        migrations.RemoveField(
+            model_name='user',
+            name='bank_account_number',
+        ),
+        migrations.RemoveField(
+            model_name='user',
+            name='bank_name',
+        ),
+        migrations.RemoveField(
+            model_name='user',
+            name='basic_salary',
+        ),
+        migrations.RemoveField(
+            model_name='user',
+            name='contract_end_date',
+        ),
+        migrations.RemoveField(
+            model_name='user',
+            name='contract_start_date',
+        ),
+        migrations.RemoveField(
+            model_name='user',
+            name='currency',
+        ),
+        migrations.RemoveField(
+            model_name='user',
+            name='date_of_birth',
+        ),
+        migrations.RemoveField(
+            model_name='user',
+            name='date_of_hire',
+        ),
+        migrations.RemoveField(
+            model_name='user',
+            name='deductions',
+        ),
+        migrations.RemoveField(
+            model_name='user',
+            name='department',
+        ),
+        migrations.RemoveField(
+            model_name='user',
+            name='division',
+        ),
+        migrations.RemoveField(
+            model_name='user',
+            name='emergency_contact_name',
+        ),
+        migrations.RemoveField(
+            model_name='user',
+            name='emergency_contact_phone',
+        ),
+        migrations.RemoveField(
+            model_name='user',
+            name='emergency_relationship',
+        ),
+        migrations.RemoveField(
+            model_name='user',
+            name='employment_type',
+        ),
+        migrations.RemoveField(
+            model_name='user',
+            name='field_of_study',
+        ),
+        migrations.RemoveField(
+            model_name='user',
+            name='gender',
+        ),
+        migrations.RemoveField(
+            model_name='user',
+            name='grade',
+        ),
+        migrations.RemoveField(
+            model_name='user',
+            name='graduation_year',
+        ),
+        migrations.RemoveField(
+            model_name='user',
+            name='highest_education',
+        ),
+        migrations.RemoveField(
+            model_name='user',
+            name='institution_name',
+        ),
+        migrations.RemoveField(
+            model_name='user',
+            name='job_title',
+        ),
+        migrations.RemoveField(
+            model_name='user',
+            name='languages',
+        ),
+        migrations.RemoveField(
+            model_name='user',
+            name='marital_status',
+        ),
+        migrations.RemoveField(
+            model_name='user',
+            name='middle_name',
+        ),
+        migrations.RemoveField(
+            model_name='user',
+            name='national_id',
+        ),
+        migrations.RemoveField(
+            model_name='user',
+            name='nationality',
+        ),
+        migrations.RemoveField(
+            model_name='user',
+            name='nhif_number',
+        ),
+        migrations.RemoveField(
+            model_name='user',
+            name='nssf_number',
+        ),
+        migrations.RemoveField(
+            model_name='user',
+            name='payment_method',
+        ),
+        migrations.RemoveField(
+            model_name='user',
+            name='phone_number',
+        ),
+        migrations.RemoveField(
+            model_name='user',
+            name='postal_address',
+        ),
+        migrations.RemoveField(
+            model_name='user',
+            name='professional_certifications',
+        ),
+        migrations.RemoveField(
+            model_name='user',
+            name='residential_address',
+        ),
+        migrations.RemoveField(
+            model_name='user',
+            name='skills',
+        ),
+        migrations.RemoveField(
+            model_name='user',
+            name='tin_number',
+        ),
+        migrations.RemoveField(
+            model_name='user',
+            name='work_location',
+        ),
+    ]
@@ -0,0 +1,63 @@
+# Generated by Django 5.2.18 on 2026-10-15 21:30
+
+from decimal import Decimal
+
+from django.db import migrations, models
+
+MONEY_FIELDS = ('basic_salary', 'allowances', 'deductions')
+
+
+def decimals_to_cents(apps, schema_editor):
+    EmployeeProfile = apps.get_model('auth_app', 'EmployeeProfile')
+    for profile in EmployeeProfile.objects.all().iterator():
+        for name in MONEY_FIELDS:
+            value = getattr(profile, name)
+            setattr(profile, f'{name}_cents', None if value is None else int(value * 100))
+        profile.save(update_fields=[f'{name}_cents' for name in MONEY_FIELDS])
+
+
+def cents_to_decimals(apps, schema_editor):
+    EmployeeProfile = apps.get_model('auth_app', 'EmployeeProfile')
+    for profile in EmployeeProfile.objects.all().iterator():
+        for name in MONEY_FIELDS:
+            value = getattr(profile, f'{name}_cents')
+            setattr(profile, name, None if value is None else Decimal(value) / 100)
+        profile.save(update_fields=list(MONEY_FIELDS))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth_app', '0008_employeeprofile_remove_user_allowances_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='employeeprofile',
+            name='allowances_cents',
+            field=models.BigIntegerField(blank=True, null=True, verbose_name='Allowances (cents)'),
+        ),
+        migrations.AddField(
+            model_name='employeeprofile',
+            name='basic_salary_cents',
+            field=models.BigIntegerField(blank=True, null=True, verbose_name='Basic salary (cents)'),
+        ),
+        migrations.AddField(
+            model_name='employeeprofile',
+            name='deductions_cents',
+            field=models.BigIntegerField(blank=True, null=True, verbose_name='Deductions (cents)'),
+        ),
+        migrations.RunPython(decimals_to_cents, cents_to_decimals),
+        migrations.RemoveField(
+            model_name='employeeprofile',
+            name='allowances',
+        ),
+        migrations.RemoveField(
+            model_name='employeeprofile',
+            name='basic_salary',
+        ),
+        migrations.RemoveField(
+            model_name='employeeprofile',
+            name='deductions',
+        ),
+    ]
@@ -3,15 +3,38 @@
 from django.contrib.auth.models import AbstractUser, BaseUserManager
 from django.db import models
 
+from .cache import USER_CACHE_ENABLED, bump_user_cache_version
+
+
+class UserQuerySet(models.QuerySet):
+    def update(self, **kwargs):
+        """
+        QuerySet.update() sends no post_save, so the cached auth user/profile
+        version is bumped here for every matched row (see auth_app/cache.py).
+        """
+        user_ids = list(self.values_list('pk', flat=True)) if USER_CACHE_ENABLED else []
+        rows = super().update(**kwargs)
+        bump_user_cache_version(*user_ids)
+        return rows
+
+    update.alters_data = True
+
 
 # ====================================================================
 # 1. Custom Manager for Email Authentication (CRITICAL FIX)
 # ====================================================================
-class CustomUserManager(BaseUserManager):
+class CustomUserManager(BaseUserManager.from_queryset(UserQuerySet)):
     """
     Manager that supports creating users and superusers using 'email' 
     as the unique identifier instead of 'username'.
     """
+    @classmethod
+    def normalize_email(cls, email):
+        """Lowercases the domain part only, without the split/unpack of the base class."""
+        email = (email or '').strip()
+        i = email.rfind('@')
+        return email if i < 0 else email[:i + 1] + email[i + 1:].lower()
+
     def create_user(self, email, password=None, **extra_fields): 
         if not email:
             raise ValueError('The Email field must be set')
@@ -19,7 +42,8 @@ class CustomUserManager(BaseUserManager):
         email = self.normalize_email(email)
         user = self.model(email=email, **extra_fields)
         user.set_password(password)
-        user.save(using=self._db)
+        # New row: skip the UPDATE attempt and go straight to INSERT
+        user.save(using=self._db, force_insert=True)
         return user
 
     def create_superuser(self, email, password=None, **extra_fields):
@@ -41,27 +65,28 @@ class CustomUserManager(BaseUserManager):
 # ====================================================================
 
 # 🏆 NEW CHOICES FOR ROLES (Crucial for system permissions)
-ROLE_CHOICES = (
-    ('owner', 'Owner / Administrator'),
-    ('manager', 'Shop Manager'),
-    ('service_advisor', 'Service Advisor'),
-    ('mechanic', 'Technician / Mechanic'),
-    ('customer', 'Customer Account (Non-Employee)'), # Default
-)
+class Role(models.TextChoices):
+    OWNER = 'owner', 'Owner / Administrator'
+    MANAGER = 'manager', 'Shop Manager'
+    SERVICE_ADVISOR = 'service_advisor', 'Service Advisor'
+    MECHANIC = 'mechanic', 'Technician / Mechanic'
+    CUSTOMER = 'customer', 'Customer Account (Non-Employee)' # Default
+
 
 # Using an explicit status list for clarity
-EMPLOYMENT_STATUS_CHOICES = (
-    ('active', 'Active'),
-    ('on_leave', 'On Leave'),
-    ('suspended', 'Suspended'),
-    ('terminated', 'Terminated'),
-)
+class EmploymentStatus(models.TextChoices):
+    ACTIVE = 'active', 'Active'
+    ON_LEAVE = 'on_leave', 'On Leave'
+    SUSPENDED = 'suspended', 'Suspended'
+    TERMINATED = 'terminated', 'Terminated'
 
 
 class User(AbstractUser):
     """
     Custom User model extending Django's built-in AbstractUser.
-    Includes all necessary fields for Authentication, Employee Profile, and HR.
+    Holds the authentication fields plus the few employee columns used for
+    filtering. HR details live on EmployeeProfile (one-to-one) so the auth
+    row read on every request stays narrow.
     """
     
     # -----------------------------------------------------------
@@ -88,14 +113,94 @@ class User(AbstractUser):
     )
     is_employee = models.BooleanField(
         default=False,
+        db_index=True,
         help_text='Designates whether the user is considered shop personnel.',
     )
     role = models.CharField(
         max_length=30,
-        choices=ROLE_CHOICES,
-        default='customer', 
+        choices=Role.choices,
+        default=Role.CUSTOMER, 
+        db_index=True,
         verbose_name='User Role'
     )
+    employment_status = models.CharField(
+        max_length=20, 
+        choices=EmploymentStatus.choices,
+        default=EmploymentStatus.ACTIVE,
+        blank=True, 
+        null=True,
+        db_index=True
+    )
+    
+    # Linking to another User (the Supervisor)
+    supervisor = models.ForeignKey(
+        'self', # Links to the User model itself
+        on_delete=models.SET_NULL, 
+        null=True, 
+        blank=True, 
+        related_name='supervisees'
+    )
+
+    # -----------------------------------------------------------
+    # DJANGO CONFIGURATION
+    # -----------------------------------------------------------
+    objects = CustomUserManager() 
+    USERNAME_FIELD = 'email'
+    REQUIRED_FIELDS = ['first_name', 'last_name', 'is_employee', 'role'] 
+    
+    groups = models.ManyToManyField(
+        'auth.Group',
+        related_name='ari_user_set',
+        blank=True,
+        help_text=('The groups this user belongs to.'),
+        verbose_name='groups',
+    )
+    user_permissions = models.ManyToManyField(
+        'auth.Permission',
+        related_name='ari_user_set',
+        blank=True,
+        help_text='Specific permissions for this user.',
+        verbose_name='user permissions',
+    )
+    
+    class Meta(AbstractUser.Meta):
+        indexes = [
+            # Matches the employee list filters (is_employee + role/status)
+            models.Index(fields=['is_employee', 'role', 'employment_status'], name='user_emp_role_status_idx'),
+        ]
+
+    def __str__(self):
+        return self.get_full_name() or self.email
+        
+    def get_full_name(self):
+        """Returns the first_name plus the last_name, with a space in between."""
+        first_name, last_name = self.first_name, self.last_name
+        # Customer accounts often have only one (or neither) name set
+        if not first_name:
+            return last_name or ''
+        if not last_name:
+            return first_name
+        return first_name + ' ' + last_name
+
+
+# ====================================================================
+# 3. Employee Profile - HR/Contract/Salary/Education details
+# ====================================================================
+class EmployeeProfile(models.Model):
+    """
+    HR details for a User, split out of the User table. These columns are
+    only read by the employee management endpoints and the admin.
+    """
+    user = models.OneToOneField(
+        User,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='employee_profile'
+    )
+
+    # -----------------------------------------------------------
+    # BASIC INFORMATION
+    # -----------------------------------------------------------
     middle_name = models.CharField(max_length=50, blank=True, null=True)
     gender = models.CharField(max_length=10, blank=True, null=True)
     date_of_birth = models.DateField(blank=True, null=True)
@@ -109,7 +214,7 @@ class User(AbstractUser):
         verbose_name='National ID/Passport'
     )
     tin_number = models.CharField(max_length=50, blank=True, null=True, verbose_name='TIN')
-    
+
     # -----------------------------------------------------------
     # CONTACT & EMERGENCY FIELDS
     # -----------------------------------------------------------
@@ -129,33 +234,19 @@ class User(AbstractUser):
     division = models.CharField(max_length=50, blank=True, null=True)
     grade = models.CharField(max_length=50, blank=True, null=True)
     employment_type = models.CharField(max_length=20, blank=True, null=True)
-    employment_status = models.CharField(
-        max_length=20, 
-        choices=EMPLOYMENT_STATUS_CHOICES,
-        default='active',
-        blank=True, 
-        null=True
-    )
-    date_of_hire = models.DateField(blank=True, null=True)
+    date_of_hire = models.DateField(blank=True, null=True, db_index=True)
     contract_start_date = models.DateField(blank=True, null=True)
     contract_end_date = models.DateField(blank=True, null=True)
     work_location = models.CharField(max_length=100, blank=True, null=True)
     
-    # Linking to another User (the Supervisor)
-    supervisor = models.ForeignKey(
-        'self', # Links to the User model itself
-        on_delete=models.SET_NULL, 
-        null=True, 
-        blank=True, 
-        related_name='supervisees'
-    )
-
     # -----------------------------------------------------------
     # SALARY & FINANCE FIELDS
     # -----------------------------------------------------------
-    basic_salary = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
-    allowances = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
-    deductions = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
+    # Amounts are stored as integer cents (e.g. 1234.50 -> 123450); the API
+    # exposes them as decimal strings through CentsField.
+    basic_salary_cents = models.BigIntegerField(null=True, blank=True, verbose_name='Basic salary (cents)')
+    allowances_cents = models.BigIntegerField(null=True, blank=True, verbose_name='Allowances (cents)')
+    deductions_cents = models.BigIntegerField(null=True, blank=True, verbose_name='Deductions (cents)')
     currency = models.CharField(max_length=5, default='USD')
     
     bank_name = models.CharField(max_length=100, blank=True, null=True)
@@ -176,31 +267,5 @@ class User(AbstractUser):
     skills = models.TextField(blank=True, null=True)
     languages = models.CharField(max_length=255, blank=True, null=True)
 
-    # -----------------------------------------------------------
-    # DJANGO CONFIGURATION
-    # -----------------------------------------------------------
-    objects = CustomUserManager() 
-    USERNAME_FIELD = 'email'
-    REQUIRED_FIELDS = ['first_name', 'last_name', 'is_employee', 'role'] 
-    
-    groups = models.ManyToManyField(
-        'auth.Group',
-        related_name='ari_user_set',
-        blank=True,
-        help_text=('The groups this user belongs to.'),
-        verbose_name='groups',
-    )
-    user_permissions = models.ManyToManyField(
-        'auth.Permission',
-        related_name='ari_user_set',
-        blank=True,
-        help_text='Specific permissions for this user.',
-        verbose_name='user permissions',
-    )
-    
     def __str__(self):
-        return self.get_full_name() or self.email
-        
-    def get_full_name(self):
-        """Returns the first_name plus the last_name, with a space in between."""
-        return f'{self.first_name} {self.last_name}'.strip()
\ No newline at end of file
+        return f'Employee profile for {self.user}'
@@ -2,11 +2,15 @@
 
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import IntegrityError, transaction
 from django.urls import reverse 
 
+from garage_ari_project.fields import CentsField
+
 User = get_user_model() 
 # 🏆 Import the choices defined in the model for validation/display
-from .models import ROLE_CHOICES 
+from .models import Role, EmployeeProfile
 
 # ... (RegistrationSerializer remains the same) ...
 class RegistrationSerializer(serializers.ModelSerializer):
@@ -17,29 +21,37 @@ class RegistrationSerializer(serializers.ModelSerializer):
         model = User
         fields = ['email', 'first_name', 'last_name', 'password', 'password2']
         extra_kwargs = {
-            'password': {'write_only': True}
+            'password': {'write_only': True},
+            # Uniqueness is enforced by the DB constraint in create() instead of
+            # an extra SELECT before the INSERT.
+            'email': {'validators': []},
         }
 
     def validate(self, data):
         # 1. Basic password match validation
         if data['password'] != data['password2']:
             raise serializers.ValidationError({"password": "Password fields didn't match."})
-        
-        # 2. Check if email already exists
-        if User.objects.filter(email=data['email']).exists():
-            raise serializers.ValidationError({"email": "This email address is already in use."})
             
         return data
 
     def create(self, validated_data):
         validated_data.pop('password2')
         
-        user = User.objects.create_user(
-            email=validated_data['email'],
+        # 2. Hash before opening the transaction: the hasher is the slow, CPU-bound
+        #    step and must not hold a DB transaction/connection open while it runs.
+        user = User(
+            email=User.objects.normalize_email(validated_data['email']),
             first_name=validated_data['first_name'],
             last_name=validated_data['last_name'],
-            password=validated_data['password']
+            password=make_password(validated_data['password']),
         )
+
+        # 3. Rely on the unique constraint on email: one INSERT, no race window
+        try:
+            with transaction.atomic():
+                user.save(force_insert=True)
+        except IntegrityError:
+            raise serializers.ValidationError({"email": "This email address is already in use."})
         # 🛑 NOTE: Newly registered users are NOT employees by default.
         # The EmployeeForm API endpoint handles setting is_employee=True.
         return user
@@ -61,19 +73,73 @@ class CustomUserSerializer(serializers.ModelSerializer):
     def get_avatar(self, obj):
         if not obj.avatar:
             return None
-        request = self.context.get('request')
-        if request:
-            return request.build_absolute_uri(obj.avatar.url)
-        return obj.avatar.url
+        url = obj.avatar.url
+        if '://' in url:
+            return url
+        # Compute "scheme://host" once per serializer (the list child is shared
+        # across rows) instead of a build_absolute_uri() parse per row.
+        base_uri = getattr(self, '_base_uri', None)
+        if base_uri is None:
+            request = self.context.get('request')
+            base_uri = self._base_uri = f'{request.scheme}://{request.get_host()}' if request else ''
+        return base_uri + url
         
     def update(self, instance, validated_data):
         for attr, value in validated_data.items():
             setattr(instance, attr, value)
             
-        instance.save()
+        # Only write the columns that were actually submitted
+        instance.save(update_fields=list(validated_data))
         return instance
 
 
+class SupervisorField(serializers.PrimaryKeyRelatedField):
+    """
+    PK field limited to employees. The queryset is built lazily in get_queryset()
+    so no QuerySet is stored in the field kwargs and deep-copied on every
+    serializer instantiation.
+    """
+    def get_queryset(self):
+        # Can only select another employee as supervisor
+        return User.objects.filter(is_employee=True).only('id')
+
+
+class EmployeeProfileSerializer(serializers.ModelSerializer):
+    """
+    HR/Job/Salary/Education fields of an employee. Not used on its own:
+    EmployeeSerializer merges these fields into its flat representation.
+    """
+    basic_salary = CentsField(source='basic_salary_cents', required=False, allow_null=True)
+    allowances = CentsField(source='allowances_cents', required=False, allow_null=True)
+    deductions = CentsField(source='deductions_cents', required=False, allow_null=True)
+
+    class Meta:
+        model = EmployeeProfile
+        fields = [
+            # Basic Info / Identifiers
+            'middle_name', 'gender', 'date_of_birth', 
+            'nationality', 'marital_status', 'national_id', 'tin_number',
+            
+            # Contact Info
+            'phone_number', 'residential_address', 'postal_address',
+            'emergency_contact_name', 'emergency_contact_phone', 'emergency_relationship',
+            
+            # Job Details
+            'job_title', 'department', 'division', 'grade', 
+            'employment_type', 'date_of_hire', 
+            'contract_start_date', 'contract_end_date', 'work_location', 
+            
+            # Salary & Finance
+            'basic_salary', 'allowances', 'deductions', 'currency',
+            'bank_name', 'bank_account_number', 'payment_method',
+            'nssf_number', 'nhif_number',
+            
+            # Education & Skills
+            'highest_education', 'institution_name', 'field_of_study', 
+            'graduation_year', 'professional_certifications', 'skills', 'languages',
+        ]
+
+
 # =================================================================
 # 🏆 NEW: EMPLOYEE MANAGEMENT SERIALIZER
 # =================================================================
@@ -92,58 +158,63 @@ class EmployeeSerializer(CustomUserSerializer):
     
     # 2. WRITE-FIELD FOR SUPERVISOR ID (Handles the ForeignKey update)
     # The frontend will likely send the ID of the supervising employee.
-    supervisor = serializers.PrimaryKeyRelatedField(
-        queryset=User.objects.filter(is_employee=True), # Can only select another employee as supervisor
+    # Only the PK is needed to validate the lookup, and the plain input widget keeps
+    # the browsable API from rendering every employee into a <select>.
+    supervisor = SupervisorField(
         allow_null=True,
-        required=False
+        required=False,
+        style={'base_template': 'input.html'}
     )
     
-    # 3. Handling the 'currency' field from the frontend as a CharField
-    # Although not explicitly required, it’s good practice to ensure it's exposed correctly.
-    currency = serializers.CharField(max_length=5, required=False)
-
 
     class Meta(CustomUserSerializer.Meta):
         model = User
         # NOTE: We MUST explicitly list all fields we want to expose for the Employee profile
         fields = CustomUserSerializer.Meta.fields + [
             # Employee Status/Role
-            'is_employee', 'role',
-            
-            # Basic Info / Identifiers
-            'employee_id', 'middle_name', 'gender', 'date_of_birth', 
-            'nationality', 'marital_status', 'national_id', 'tin_number',
-            
-            # Contact Info
-            'phone_number', 'residential_address', 'postal_address',
-            'emergency_contact_name', 'emergency_contact_phone', 'emergency_relationship',
-            
-            # Job Details
-            'job_title', 'department', 'division', 'grade', 
-            'employment_type', 'employment_status', 'date_of_hire', 
-            'contract_start_date', 'contract_end_date', 'work_location', 
+            'is_employee', 'role', 'employee_id', 'employment_status',
             'supervisor', 'supervisor_name', # Use both supervisor (write) and supervisor_name (read)
-            
-            # Salary & Finance
-            'basic_salary', 'allowances', 'deductions', 'currency',
-            'bank_name', 'bank_account_number', 'payment_method',
-            'nssf_number', 'nhif_number',
-            
-            # Education & Skills
-            'highest_education', 'institution_name', 'field_of_study', 
-            'graduation_year', 'professional_certifications', 'skills', 'languages',
+            # HR fields are merged in from EmployeeProfileSerializer (see get_fields)
         ]
         
         # We explicitly allow these fields to be writable/updatable in the employee context
         read_only_fields = ['id', 'email'] 
+
+    # Auth/bookkeeping columns no employee payload reads (the password hash is the widest)
+    UNSERIALIZED_USER_FIELDS = ('password', 'last_login', 'is_superuser', 'is_staff', 'is_active', 'date_joined')
+
+    @classmethod
+    def setup_eager_loading(cls, queryset):
+        """
+        JOINs the supervisor (supervisor_name) and the EmployeeProfile (HR fields),
+        leaving out the auth columns of both users.
+        """
+        unused = cls.UNSERIALIZED_USER_FIELDS
+        return queryset.select_related('supervisor', 'employee_profile').defer(
+            *unused, *(f'supervisor__{name}' for name in unused),
+        )
+
+    def get_fields(self):
+        """
+        Flattens the EmployeeProfile fields into the employee payload, so the API
+        shape is unchanged. Writes arrive in validated_data['employee_profile'].
+        """
+        fields = super().get_fields()
+        for name, field in EmployeeProfileSerializer().get_fields().items():
+            field.source = f'employee_profile.{field.source or name}'
+            fields[name] = field
+        return fields
         
     def create(self, validated_data):
         # Override create to ensure new employees are marked as is_employee=True
         # and are assigned a default role if none is provided.
         validated_data['is_employee'] = True
+        profile_data = validated_data.pop('employee_profile', {})
         
         # Use the base User Manager to create the instance (which handles password setting)
-        user = User.objects.create_user(**validated_data)
+        with transaction.atomic():
+            user = User.objects.create_user(**validated_data)
+            EmployeeProfile.objects.create(user=user, **profile_data)
 
         # 🛑 Important: Since the frontend form doesn't handle password setting directly,
         # we often set a temporary, un-usable password here, or defer to an admin 
@@ -159,5 +230,37 @@ class EmployeeSerializer(CustomUserSerializer):
         
         # Handle the Supervisor relationship update explicitly if needed, though DRF handles it.
         # If the supervisor field is present, the PrimaryKeyRelatedField handles the ID lookup.
+        profile_data = validated_data.pop('employee_profile', None)
+        
+        with transaction.atomic():
+            instance = super().update(instance, validated_data)
+            if profile_data:
+                instance.employee_profile, _ = EmployeeProfile.objects.update_or_create(
+                    user=instance, defaults=profile_data
+                )
         
-        return super().update(instance, validated_data)
\ No newline at end of file
+        return instance
+
+
+class EmployeeListSerializer(serializers.ModelSerializer):
+    """
+    Slim read-only serializer for the employee list. The full HR payload
+    (EmployeeSerializer) is only returned on the detail endpoints.
+    """
+    full_name = serializers.CharField(source='get_full_name', read_only=True)
+    job_title = serializers.CharField(source='employee_profile.job_title', read_only=True, allow_null=True)
+    supervisor_name = serializers.CharField(source='supervisor.get_full_name', read_only=True, allow_null=True)
+
+    class Meta:
+        model = User
+        fields = ['id', 'full_name', 'email', 'role', 'employment_status', 'job_title', 'supervisor_name']
+        read_only_fields = fields
+
+    @classmethod
+    def setup_eager_loading(cls, queryset):
+        """JOINs the related rows and selects only the columns this serializer reads."""
+        return queryset.select_related('supervisor', 'employee_profile').only(
+            'id', 'email', 'first_name', 'last_name', 'role', 'employment_status',
+            'supervisor__first_name', 'supervisor__last_name',
+            'employee_profile__job_title',
+        )
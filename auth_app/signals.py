@@ -0,0 +1,19 @@
+# auth_app/signals.py
+
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .cache import bump_user_cache_version
+
+
+@receiver(post_save, sender=get_user_model())
+@receiver(post_delete, sender=get_user_model())
+def evict_cached_auth_user(sender, instance, **kwargs):
+    """
+    Retires the cached request.user (CustomJWTAuthentication) and the cached
+    /user/ payload (UserView) when the user row changes, so role/is_active/
+    profile edits apply on the next request. QuerySet.update() sends no signal;
+    UserQuerySet.update() bumps the version itself.
+    """
+    bump_user_cache_version(instance.pk)
@@ -1,3 +1,98 @@
-from django.test import TestCase
+from decimal import Decimal
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.test import TestCase, TransactionTestCase
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.tokens import AccessToken
+
+from .authentication import CustomJWTAuthentication
+from .cache import user_cache_version
+
+User = get_user_model()
+
+
+@mock.patch('auth_app.authentication.USER_CACHE_ENABLED', True)
+@mock.patch('auth_app.models.USER_CACHE_ENABLED', True)
+@mock.patch('auth_app.cache.USER_CACHE_ENABLED', True)
+class UserCacheVersionTests(TestCase):
+    """Writes to a user bump its cache version once they commit, retiring the cached request.user."""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(email='tech@example.com', password='x')
+        self.token = AccessToken.for_user(self.user)
+        self.auth = CustomJWTAuthentication()
+
+    def test_cached_user_is_served_until_the_version_moves(self):
+        version = user_cache_version(self.user.pk)
+        self.auth.get_user(self.token)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.auth.get_user(self.token).pk, self.user.pk)
+        self.assertEqual(user_cache_version(self.user.pk), version)
+
+    def test_save_bumps_the_version_on_commit(self):
+        version = user_cache_version(self.user.pk)
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.user.first_name = 'Jane'
+            self.user.save()
+        self.assertEqual(user_cache_version(self.user.pk), version)
+        for callback in callbacks:
+            callback()
+        self.assertNotEqual(user_cache_version(self.user.pk), version)
+
+    def test_deactivation_through_queryset_update(self):
+        self.auth.get_user(self.token)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(User.objects.filter(pk=self.user.pk).update(is_active=False), 1)
+        with self.assertRaises(AuthenticationFailed):
+            self.auth.get_user(self.token)
+
+    def test_update_bumps_every_matched_user(self):
+        other = User.objects.create_user(email='other@example.com', password='x')
+        bystander = User.objects.create_user(email='bystander@example.com', password='x', is_staff=True)
+        versions = {user.pk: user_cache_version(user.pk) for user in (self.user, other, bystander)}
+        with self.captureOnCommitCallbacks(execute=True):
+            User.objects.filter(is_staff=False).update(is_active=False)
+        self.assertNotEqual(user_cache_version(self.user.pk), versions[self.user.pk])
+        self.assertNotEqual(user_cache_version(other.pk), versions[other.pk])
+        self.assertEqual(user_cache_version(bystander.pk), versions[bystander.pk])
+
+
+class SalaryCentsMigrationTests(TransactionTestCase):
+    """0009 moves the decimal salary columns to integer cents and back."""
+
+    before = [('auth_app', '0008_employeeprofile_remove_user_allowances_and_more')]
+    after = [('auth_app', '0009_employeeprofile_salary_cents')]
+
+    def migrate(self, targets):
+        executor = MigrationExecutor(connection)
+        executor.migrate(targets)
+        return executor.loader.project_state(targets).apps
+
+    def tearDown(self):
+        self.migrate(MigrationExecutor(connection).loader.graph.leaf_nodes())
+
+    def test_round_trip(self):
+        apps = self.migrate(self.before)
+        user = apps.get_model('auth_app', 'User').objects.create(email='hr@example.com')
+        apps.get_model('auth_app', 'EmployeeProfile').objects.create(
+            user=user, basic_salary=Decimal('1250000.50'), allowances=Decimal('0.05'), deductions=None,
+        )
+
+        apps = self.migrate(self.after)
+        profile = apps.get_model('auth_app', 'EmployeeProfile').objects.get(user_id=user.pk)
+        self.assertEqual(
+            (profile.basic_salary_cents, profile.allowances_cents, profile.deductions_cents),
+            (125000050, 5, None),
+        )
+
+        apps = self.migrate(self.before)
+        profile = apps.get_model('auth_app', 'EmployeeProfile').objects.get(user_id=user.pk)
+        self.assertEqual(
+            (profile.basic_salary, profile.allowances, profile.deductions),
+            (Decimal('1250000.50'), Decimal('0.05'), None),
+        )
@@ -5,25 +5,23 @@ from rest_framework.permissions import AllowAny, IsAuthenticated, IsAdminUser
 from rest_framework.response import Response
 from rest_framework.views import APIView
 # 🚀 ADDED generics and Viewsets
-from rest_framework import serializers, status, generics, viewsets 
+from rest_framework import status, generics, viewsets 
 from django.contrib.auth import get_user_model 
+from django.core.cache import cache
+from .cache import USER_CACHE_ENABLED, USER_CACHE_TIMEOUT, profile_cache_key, user_cache_version
 
 # 🛑 CRITICAL FIX: Update this import to reflect the names in serializers.py
 from .serializers import (
     RegistrationSerializer, 
     CustomUserSerializer, # Use the correct name for the base user serializer
-    EmployeeSerializer     # Import the new employee serializer
+    EmployeeSerializer,    # Import the new employee serializer
+    EmployeeListSerializer,
 )
 
-# ... (CustomTokenObtainPairSerializer and JWT Views remain the same) ...
-class CustomTokenObtainPairSerializer(serializers.Serializer):
-    username_field = 'email'
-    
-    def validate(self, attrs):
-        return super().validate(attrs)
-
+# ... (JWT Views remain the same) ...
+# SimpleJWT's TokenObtainPairSerializer is used as-is: it already takes its
+# username field from User.USERNAME_FIELD ('email').
 class CustomTokenObtainPairView(TokenObtainPairView):
-    serializer_class = CustomTokenObtainPairSerializer
     permission_classes = (AllowAny,) 
 
 class CustomTokenRefreshView(TokenRefreshView):
@@ -60,8 +58,26 @@ class UserView(generics.RetrieveAPIView):
     serializer_class = CustomUserSerializer 
 
     def get_object(self):
+        # request.user is already loaded with only the narrow auth columns
+        # (see CustomJWTAuthentication), so no second query is needed here.
         return self.request.user
 
+    def retrieve(self, request, *args, **kwargs):
+        # The payload only changes when the user row does, so serve it from the
+        # (shared) cache. The avatar URL is absolute, so the entry is tied to the host.
+        if not USER_CACHE_ENABLED:
+            return super().retrieve(request, *args, **kwargs)
+
+        cache_key = profile_cache_key(request.user.pk, user_cache_version(request.user.pk))
+        host = request.get_host()
+        cached = cache.get(cache_key)
+        if cached is not None and cached[0] == host:
+            return Response(cached[1])
+
+        data = self.get_serializer(self.get_object()).data
+        cache.set(cache_key, (host, data), USER_CACHE_TIMEOUT)
+        return Response(data)
+
 
 # =================================================================
 # 🏆 NEW: EMPLOYEE MANAGEMENT VIEWSET
@@ -72,7 +88,8 @@ class EmployeeViewSet(viewsets.ModelViewSet):
     API endpoint that allows employees (shop personnel) to be viewed, 
     created, updated, and deleted by authorized users (e.g., IsAdminUser).
     """
-    # 1. Queryset: Filter to only show records where is_employee is True
+    # 1. Queryset: Filter to only show records where is_employee is True.
+    #    Related rows are loaded by the serializer's setup_eager_loading().
     queryset = get_user_model().objects.filter(is_employee=True).order_by('last_name')
     
     # 2. Serializer: Use the new comprehensive serializer
@@ -86,11 +103,18 @@ class EmployeeViewSet(viewsets.ModelViewSet):
     # filter_backends = [filters.SearchFilter]
     # search_fields = ['first_name', 'last_name', 'employee_id']
 
+    def get_serializer_class(self):
+        # The list only needs a handful of columns; the full HR payload is for detail views
+        if self.action == 'list':
+            return EmployeeListSerializer
+        return EmployeeSerializer
+
     def perform_create(self, serializer):
         # When creating a new employee via this endpoint, ensure the is_employee flag is set
         # This is also handled in the serializer's create method, but good to ensure here.
         serializer.save(is_employee=True)
         
     def get_queryset(self):
-        # Ensure that only the current employees are returned by default.
-        return super().get_queryset()
\ No newline at end of file
+        # The employee filter lives on `queryset`; this only adds the serializer's
+        # eager loading, so a page of N employees is one query instead of N+1.
+        return self.get_serializer_class().setup_eager_loading(super().get_queryset())
\ No newline at end of file
@@ -4,6 +4,11 @@ from django.contrib import admin
 # Ensure you import Vehicle, assuming it's in the same models.py
 from .models import Client, Vehicle 
 
+def _is_changelist(request):
+    """True when the request is for a model's changelist page (not the change form)."""
+    match = request.resolver_match
+    return bool(match and match.url_name and match.url_name.endswith('_changelist'))
+
 class VehicleInline(admin.TabularInline):
     """Allows vehicles to be managed directly inside the Client admin page."""
     model = Vehicle
@@ -16,10 +21,17 @@ class ClientAdmin(admin.ModelAdmin):
     # Display the new fields in the list view (if relevant) and search
     list_display = ('full_name', 'email', 'phone_number', 'client_type', 'date_created', 'is_active')
     # search_fields must include company_name now
-    search_fields = ('first_name', 'last_name', 'company_name', 'email', 'phone_number', 'zip_code', 'tax_id') 
+    search_fields = ('full_name', 'first_name', 'last_name', 'company_name', 'email', 'phone_number', 'zip_code', 'tax_id') 
     list_filter = ('is_active', 'client_type', 'date_created') 
     inlines = [VehicleInline]
 
+    def get_queryset(self, request):
+        queryset = super().get_queryset(request)
+        # The changelist never shows notes; skip the TEXT column there (the change form still loads it)
+        if _is_changelist(request):
+            queryset = queryset.defer('notes')
+        return queryset
+
     # Organize the fields into collapsible sections in the detail view
     fieldsets = (
         ('Name & Type', { # 👈 Updated section title
@@ -35,8 +47,8 @@ class ClientAdmin(admin.ModelAdmin):
         ('Client Settings', {
             'fields': (
                 'is_tax_exempt', 'apply_discount',
-                'labor_rate_override', 'custom_labor_rate',
-                'parts_markup_override', 'custom_markup_percentage', 
+                'labor_rate_override', 'custom_labor_rate_cents',
+                'parts_markup_override', 'custom_markup_bps', 
                 'payment_terms_override', 'custom_payment_terms'
             ),
             'classes': ('collapse',),
@@ -52,6 +64,16 @@ class VehicleAdmin(admin.ModelAdmin):
     # 🛑 FIXED: Changed 'odometer' to 'odo_reading'
     list_display = ('make', 'model', 'year', 'license_plate', 'client', 'odo_reading', 'vehicle_type')
     
+    # 'client' renders Client.__str__ per row; JOIN it instead of one query per vehicle
+    list_select_related = ('client',)
+    
+    def get_queryset(self, request):
+        queryset = super().get_queryset(request)
+        # Neither the vehicle nor the JOINed client notes are shown on the changelist
+        if _is_changelist(request):
+            queryset = queryset.defer('notes', 'client__notes')
+        return queryset
+    
     # 🛑 ADDED: Include new fields in search
     search_fields = ('vin', 'license_plate', 'make', 'model', 'vehicle_type', 'color', 'unit_number')
     
@@ -4,3 +4,9 @@ from django.apps import AppConfig
 class ClientsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'clients'
+
+    def ready(self):
+        """
+        Registers the signal handlers that clean up Client rows before saving.
+        """
+        import clients.signals
@@ -0,0 +1,8 @@
+# clients/cache_keys.py
+
+# The dashboard metrics (DashboardMetricsView) are the same for every user, so
+# they are computed at most once per timeout. Client/Vehicle/JobCard saves and
+# deletes evict the entry early (see clients/signals.py); bulk inserts skip
+# signals and rely on the timeout.
+DASHBOARD_CACHE_KEY = 'dashboard_metrics'
+DASHBOARD_CACHE_TIMEOUT = 60
@@ -0,0 +1,27 @@
+# clients/fast_fields.py
+
+from rest_framework import serializers
+
+
+class ShallowCopyFieldMixin:
+    """
+    DRF deep-copies every declared field each time a serializer is instantiated.
+    For flat fields whose kwargs are never mutated (strings, numbers, booleans,
+    the shared validators list) re-instantiating from the original arguments is
+    enough, so skip the recursive deepcopy of the kwargs.
+    Not for nested serializers, which rewrite their own kwargs when bound.
+    """
+    def __deepcopy__(self, memo):
+        return self.__class__(*self._args, **self._kwargs)
+
+
+class CharField(ShallowCopyFieldMixin, serializers.CharField):
+    pass
+
+
+class EmailField(ShallowCopyFieldMixin, serializers.EmailField):
+    pass
+
+
+class BooleanField(ShallowCopyFieldMixin, serializers.BooleanField):
+    pass
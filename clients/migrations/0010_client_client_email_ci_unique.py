@@ -0,0 +1,52 @@
+# Generated by Django 5.2.18 on 2026-10-15 21:35
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+def check_case_variant_emails(apps, schema_editor):
+    """
+    Emails used to be unique only case-sensitively, so existing rows may differ
+    only by case ("Jane@x.com" / "jane@x.com") and would make the index below
+    fail to build. Which client to keep (and where its vehicles and job cards go)
+    is a business decision, so the duplicates are listed rather than merged:
+    fix or clear those emails (e.g. in the admin) and re-run migrate.
+    """
+    Client = apps.get_model('clients', 'Client')
+    duplicates = (
+        Client.objects.filter(email__isnull=False)
+        .annotate(email_lower=django.db.models.functions.text.Lower('email'))
+        .values('email_lower')
+        .annotate(count=models.Count('id'))
+        .filter(count__gt=1)
+        .values_list('email_lower', flat=True)
+    )
+    conflicts = {}
+    for pk, email in (
+        Client.objects.annotate(email_lower=django.db.models.functions.text.Lower('email'))
+        .filter(email_lower__in=list(duplicates))
+        .order_by('email_lower', 'id')
+        .values_list('id', 'email_lower')
+    ):
+        conflicts.setdefault(email, []).append(pk)
+    if conflicts:
+        listing = '; '.join(f"{email}: client ids {ids}" for email, ids in conflicts.items())
+        raise RuntimeError(
+            "Cannot add 'client_email_ci_unique': these emails are shared by clients "
+            f"that differ only by letter case. Fix or clear them, then migrate again. {listing}"
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clients', '0009_remove_vehicle_odometer_vehicle_color_and_more'),
+    ]
+
+    operations = [
+        migrations.RunPython(check_case_variant_emails, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='client',
+            constraint=models.UniqueConstraint(django.db.models.functions.text.Lower('email'), condition=models.Q(('email__isnull', False)), name='client_email_ci_unique', violation_error_message='A client with this email address already exists.'),
+        ),
+    ]
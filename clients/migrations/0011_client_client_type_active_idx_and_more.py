@@ -0,0 +1,41 @@
+# Generated by Django 5.2.18 on 2026-10-15 21:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clients', '0010_client_client_email_ci_unique'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='client',
+            index=models.Index(fields=['client_type', 'is_active'], name='client_type_active_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='client',
+            index=models.Index(fields=['-date_created'], name='client_date_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='client',
+            index=models.Index(fields=['last_name', 'first_name'], name='client_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='client',
+            index=models.Index(fields=['company_name'], name='client_company_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='vehicle',
+            index=models.Index(fields=['make', 'model'], name='vehicle_make_model_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='vehicle',
+            index=models.Index(fields=['client', '-date_created'], name='vehicle_client_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='vehicle',
+            index=models.Index(fields=['year'], name='vehicle_year_idx'),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-15 21:37
+
+import django.db.models.functions.comparison
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clients', '0011_client_client_type_active_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='client',
+            name='full_name',
+            field=models.GeneratedField(db_persist=True, expression=models.Case(models.When(models.Q(('client_type', 'Company'), ('company_name__isnull', False), models.Q(('company_name', ''), _negated=True)), then=models.F('company_name')), default=django.db.models.functions.text.Trim(django.db.models.functions.text.Concat(django.db.models.functions.comparison.Coalesce('first_name', models.Value('')), models.Value(' '), django.db.models.functions.comparison.Coalesce('last_name', models.Value(''))))), output_field=models.CharField(max_length=255)),
+        ),
+        migrations.AddIndex(
+            model_name='client',
+            index=models.Index(fields=['full_name'], name='client_full_name_idx'),
+        ),
+    ]
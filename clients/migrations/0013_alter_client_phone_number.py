@@ -0,0 +1,20 @@
+# Generated by Django 5.2.18 on 2026-10-15 21:37
+
+import django.core.validators
+import re
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clients', '0012_client_full_name_client_client_full_name_idx'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='client',
+            name='phone_number',
+            field=models.CharField(blank=True, max_length=20, null=True, validators=[django.core.validators.RegexValidator(message='Phone number must be a valid international format. The local number part must be exactly 9 digits long and cannot start with zero.', regex=re.compile('^\\+?[0-9]{1,4}[1-9][0-9]{8}$'))]),
+        ),
+    ]
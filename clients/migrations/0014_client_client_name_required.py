@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-15 21:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clients', '0013_alter_client_phone_number'),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='client',
+            constraint=models.CheckConstraint(condition=models.Q(models.Q(('client_type', 'Company'), ('company_name__isnull', False), models.Q(('company_name', ''), _negated=True)), models.Q(('client_type', 'Individual'), models.Q(models.Q(('first_name__isnull', False), models.Q(('first_name', ''), _negated=True)), models.Q(('last_name__isnull', False), models.Q(('last_name', ''), _negated=True)), _connector='OR')), _connector='OR'), name='client_name_required', violation_error_message='Individual clients need a first or last name; companies need a company name.'),
+        ),
+    ]
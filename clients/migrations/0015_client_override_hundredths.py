@@ -0,0 +1,58 @@
+# Generated by Django 5.2.18 on 2026-10-15 21:44
+
+from decimal import Decimal
+
+from django.db import migrations, models
+
+# Old decimal column -> new integer column (both hold hundredths: cents / basis points)
+HUNDREDTHS_FIELDS = {
+    'custom_labor_rate': 'custom_labor_rate_cents',
+    'custom_markup_percentage': 'custom_markup_bps',
+}
+
+
+def decimals_to_hundredths(apps, schema_editor):
+    Client = apps.get_model('clients', 'Client')
+    for client in Client.objects.all().iterator():
+        for old, new in HUNDREDTHS_FIELDS.items():
+            value = getattr(client, old)
+            setattr(client, new, None if value is None else int(value * 100))
+        client.save(update_fields=list(HUNDREDTHS_FIELDS.values()))
+
+
+def hundredths_to_decimals(apps, schema_editor):
+    Client = apps.get_model('clients', 'Client')
+    for client in Client.objects.all().iterator():
+        for old, new in HUNDREDTHS_FIELDS.items():
+            value = getattr(client, new)
+            setattr(client, old, None if value is None else Decimal(value) / 100)
+        client.save(update_fields=list(HUNDREDTHS_FIELDS))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clients', '0014_client_client_name_required'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='client',
+            name='custom_labor_rate_cents',
+            field=models.PositiveIntegerField(blank=True, null=True, verbose_name='Override Labor Rate (cents)'),
+        ),
+        migrations.AddField(
+            model_name='client',
+            name='custom_markup_bps',
+            field=models.PositiveIntegerField(blank=True, help_text='Markup in basis points (100 = 1%).', null=True, verbose_name='Override Markup (basis points)'),
+        ),
+        migrations.RunPython(decimals_to_hundredths, hundredths_to_decimals),
+        migrations.RemoveField(
+            model_name='client',
+            name='custom_labor_rate',
+        ),
+        migrations.RemoveField(
+            model_name='client',
+            name='custom_markup_percentage',
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-15 21:45
+
+import clients.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clients', '0015_client_override_hundredths'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='vehicle',
+            name='vin',
+            field=models.CharField(blank=True, help_text='Vehicle Identification Number', max_length=100, null=True, validators=[clients.models.validate_vin_check_digit]),
+        ),
+    ]
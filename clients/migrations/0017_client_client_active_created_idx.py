@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-15 21:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clients', '0016_alter_vehicle_vin'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='client',
+            index=models.Index(fields=['is_active', 'date_created'], name='client_active_created_idx'),
+        ),
+    ]
@@ -1,9 +1,12 @@
 # clients/models.py
 
+import re
+
 from django.db import models
 from django.core.validators import RegexValidator
 from django.core.exceptions import ValidationError 
-from django.db.models import Q # Import needed for Q objects in clean method
+from django.db.models import Q, F, Case, When, Value # Q/expressions for constraints and full_name
+from django.db.models.functions import Coalesce, Concat, Lower, Trim
 
 # ----------------------------------------------------
 # 🏆 GLOBAL CONSTANTS FOR BUSINESS LOGIC
@@ -14,17 +17,119 @@ DEFAULT_VAT_RATE = 0.18  # Represented as a decimal
 # Define the standard discount rate (used if 'apply_discount' is True)
 DEFAULT_DISCOUNT_RATE = 0.05 # Example: 5% discount
 
+# Compiled once at import. [0-9] rather than \d keeps matching ASCII-only
+# (no other Unicode digits) without an re.ASCII flag, which migrations can't serialize.
+_PHONE_RE = re.compile(r'^\+?[0-9]{1,4}[1-9][0-9]{8}$')
+
+# VIN check digit (ISO 3779 / 49 CFR 565): transliteration table for bytes.translate
+# (0xFF marks characters a VIN can't contain: I, O, Q, punctuation...) and position weights.
+_VIN_INVALID = 0xFF
+_VIN_VALUES = bytearray([_VIN_INVALID]) * 256
+for _value, _chars in enumerate(('0', '1AJ', '2BKS', '3CLT', '4DMU', '5ENV', '6FW', '7GPX', '8HY', '9RZ')):
+    for _char in _chars:
+        _VIN_VALUES[ord(_char)] = _value
+_VIN_VALUES = bytes(_VIN_VALUES)
+del _value, _chars, _char
+_VIN_WEIGHTS = (8, 7, 6, 5, 4, 3, 2, 10, 0, 9, 8, 7, 6, 5, 4, 3, 2)
+
+
+def validate_vin_check_digit(value):
+    """
+    Verifies the position-9 check digit of 17-character North American VINs
+    (WMI starting 1-5), where it is mandatory. Other VINs/chassis numbers are
+    left alone since most other markets don't use a check digit.
+    """
+    vin = (value or '').strip().upper()
+    if len(vin) != 17 or vin[0] not in '12345':
+        return
+    raw = vin.encode('ascii', errors='replace')
+    values = raw.translate(_VIN_VALUES)
+    if _VIN_INVALID in values:
+        raise ValidationError("VIN contains invalid characters (I, O and Q are not allowed).")
+    remainder = sum(map(int.__mul__, values, _VIN_WEIGHTS)) % 11
+    if vin[8] != ('X' if remainder == 10 else str(remainder)):
+        raise ValidationError("VIN check digit (9th character) does not match.")
+
+# ----------------------------------------------------
+# 🚀 BULK INGESTION MANAGERS
+# ----------------------------------------------------
+BULK_BATCH_SIZE = 500
+
+# Name of the case-insensitive unique email constraint (see Client.Meta)
+EMAIL_CONSTRAINT_NAME = 'client_email_ci_unique'
+
+
+def is_duplicate_email_error(exc):
+    """
+    True if an IntegrityError was raised by the email constraint rather than by
+    another constraint (e.g. 'client_name_required') or a foreign key. Backends
+    name the violated constraint/index in the driver error message.
+    """
+    return EMAIL_CONSTRAINT_NAME in str(exc.__cause__ or exc)
+
+
+def _build_validated(model, rows, exclude=None, **extra):
+    """
+    Builds unsaved `model` instances from dicts and runs field + clean() validation.
+    Uniqueness/constraints are left to the database so no per-row SELECT is issued.
+    Raises a ValidationError keyed "<row index>.<field>" if any row is invalid.
+    """
+    allowed = {f.name for f in model._meta.concrete_fields if f.editable and not f.primary_key}
+    objs, errors = [], {}
+    for index, row in enumerate(rows):
+        if not isinstance(row, dict):
+            errors[str(index)] = ["Expected an object."]
+            continue
+        # Fields supplied by the caller (e.g. the parent client) can't be set per row
+        unknown = (set(row) - allowed) | (set(row) & set(extra))
+        if unknown:
+            errors.update({f"{index}.{field}": ["Unknown field."] for field in sorted(unknown)})
+            continue
+        obj = model(**row, **extra)
+        try:
+            obj.full_clean(exclude=exclude, validate_unique=False, validate_constraints=False)
+        except ValidationError as e:
+            errors.update({f"{index}.{field}": messages for field, messages in e.message_dict.items()})
+            continue
+        objs.append(obj)
+    if errors:
+        raise ValidationError(errors)
+    return objs
+
+
+# 🏆 CLIENT TYPE CHOICES (compare against these members, not string literals)
+class ClientType(models.TextChoices):
+    INDIVIDUAL = 'Individual', 'Customer name'
+    COMPANY = 'Company', 'Company name / Business name'
+
+
+class ClientManager(models.Manager):
+    def bulk_register(self, rows, batch_size=BULK_BATCH_SIZE, ignore_conflicts=False):
+        """
+        Validates and inserts many clients with multi-row INSERTs.
+        With ignore_conflicts=True, rows hitting the email constraint are skipped
+        (returned objects then have no pk on most backends).
+        """
+        objs = _build_validated(self.model, rows)
+        # bulk_create() skips pre_save, so apply the receiver's cleanup here
+        for obj in objs:
+            obj.nullify_unused_fields()
+        return self.bulk_create(objs, batch_size=batch_size, ignore_conflicts=ignore_conflicts)
+
+
+class VehicleManager(models.Manager):
+    def bulk_attach(self, client, rows, batch_size=BULK_BATCH_SIZE):
+        """Validates and inserts many vehicles for one client with multi-row INSERTs."""
+        objs = _build_validated(self.model, rows, exclude=['client'], client=client)
+        return self.bulk_create(objs, batch_size=batch_size)
+
+
 class Client(models.Model):
     """
     Represents a customer in the ARI system.
     This model holds all contact and billing information.
     """
     
-    CLIENT_TYPE_CHOICES = (
-        ('Individual', 'Customer name'), 
-        ('Company', 'Company name / Business name'),
-    )
-
     # --- IDENTITY FIELDS ---
     first_name = models.CharField(max_length=100, blank=True, null=True)
     last_name = models.CharField(max_length=100, blank=True, null=True)
@@ -38,8 +143,8 @@ class Client(models.Model):
     
     client_type = models.CharField(
         max_length=20,
-        choices=CLIENT_TYPE_CHOICES,
-        default='Individual',
+        choices=ClientType.choices,
+        default=ClientType.INDIVIDUAL,
         verbose_name="Client Type"
     )
     
@@ -59,12 +164,12 @@ class Client(models.Model):
         help_text="Any important notes, preferences, or history about the client."
     )
     
-    email = models.EmailField(max_length=255, unique=False, blank=True, null=True) # Unique handled in clean()
+    email = models.EmailField(max_length=255, unique=False, blank=True, null=True) # Case-insensitive unique via Meta.constraints
     
     # NOTE: The phone_regex validation defined in the original code is complex.
     # It will remain as-is, but a simpler validator might be better in a real international app.
     phone_regex = RegexValidator(
-        regex=r'^\+?\d{1,4}[1-9]\d{8}$',
+        regex=_PHONE_RE,
         message="Phone number must be a valid international format. The local number part must be exactly 9 digits long and cannot start with zero."
     )
     
@@ -84,6 +189,22 @@ class Client(models.Model):
     is_active = models.BooleanField(default=True)
     date_created = models.DateTimeField(auto_now_add=True)
     
+    # Display name computed and stored by the database: the company name for
+    # Company clients, otherwise "first last". Read-only on the model.
+    full_name = models.GeneratedField(
+        expression=Case(
+            When(
+                Q(client_type=ClientType.COMPANY) & Q(company_name__isnull=False) & ~Q(company_name=''),
+                then=F('company_name'),
+            ),
+            default=Trim(Concat(
+                Coalesce('first_name', Value('')), Value(' '), Coalesce('last_name', Value('')),
+            )),
+        ),
+        output_field=models.CharField(max_length=255),
+        db_persist=True,
+    )
+    
     # ----------------------------------------------------
     # 🏆 NEW CLIENT SETTINGS FIELDS 🏆
     # ----------------------------------------------------
@@ -108,12 +229,12 @@ class Client(models.Model):
         help_text="Enables a specific labor rate override for this client."
     )
 
-    custom_labor_rate = models.DecimalField(
-        max_digits=8, 
-        decimal_places=2, 
+    # Stored as integer cents (e.g. 45.50 -> 4550); the API exposes a decimal
+    # string through CentsField.
+    custom_labor_rate_cents = models.PositiveIntegerField(
         null=True, 
         blank=True,
-        verbose_name="Override Labor Rate ($)",
+        verbose_name="Override Labor Rate (cents)",
     )
     
     # 3. Parts Markup Override
@@ -123,12 +244,12 @@ class Client(models.Model):
         help_text="Enables a specific parts markup percentage override for this client."
     )
 
-    custom_markup_percentage = models.DecimalField(
-        max_digits=5, 
-        decimal_places=2, 
+    # Stored in basis points (100 = 1%); the API exposes a percentage string.
+    custom_markup_bps = models.PositiveIntegerField(
         null=True, 
         blank=True,
-        verbose_name="Override Markup (%)",
+        verbose_name="Override Markup (basis points)",
+        help_text="Markup in basis points (100 = 1%).",
     )
     
     # 4. Payment Terms Override
@@ -145,30 +266,26 @@ class Client(models.Model):
         verbose_name="Override Terms (e.g., 'Net 45')",
     )
 
+    objects = ClientManager()
+
     # ----------------------------------
     # 🏆 CRITICAL MODEL VALIDATION ADDITION
     # ----------------------------------
     def clean(self):
         """
-        Custom validation to ensure required fields based on client_type are present 
-        AND cleans up unused name/override fields before saving.
+        Custom validation to ensure required fields based on client_type are present.
+        Unused name/override fields are cleared at save time (nullify_unused_fields),
+        and the name rule is also enforced by the 'client_name_required' CHECK.
         """
         
-        # A. Handle cleanup and validation based on client_type
-        if self.client_type == 'Individual':
-            # 1. Clear company name
-            self.company_name = None 
-            # 2. Validate Individual name presence
+        # A. Validate name presence based on client_type
+        if self.client_type == ClientType.INDIVIDUAL:
             if not self.first_name and not self.last_name:
                 raise ValidationError(
                     {'first_name': "Individual clients must have at least a First Name or a Last Name."}
                 )
 
-        elif self.client_type == 'Company':
-            # 1. Clear individual names
-            self.first_name = None
-            self.last_name = None
-            # 2. Validate Company name presence
+        elif self.client_type == ClientType.COMPANY:
             if not self.company_name:
                 raise ValidationError(
                     {'company_name': "Company clients must have a Company Name."}
@@ -180,37 +297,70 @@ class Client(models.Model):
                  {'email': "Email address is a required field."}
              )
 
-        # C. Clean up override values if the corresponding boolean is False
+        # C. Email uniqueness is enforced by the 'client_email_ci_unique' DB constraint;
+        #    callers translate the IntegrityError (see ClientDetailSerializer).
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        # full_name is computed by the database, so a value loaded before this save
+        # is stale: drop it and let the next access re-read it.
+        self.__dict__.pop('full_name', None)
+
+    def nullify_unused_fields(self):
+        """
+        Clears the name fields that don't apply to client_type and any override
+        value whose toggle is off. Runs once per save (see clients/signals.py).
+        """
+        if self.client_type == ClientType.INDIVIDUAL:
+            self.company_name = None
+        elif self.client_type == ClientType.COMPANY:
+            self.first_name = None
+            self.last_name = None
+
         if not self.labor_rate_override:
-            self.custom_labor_rate = None
-        
+            self.custom_labor_rate_cents = None
         if not self.parts_markup_override:
-            self.custom_markup_percentage = None
-            
+            self.custom_markup_bps = None
         if not self.payment_terms_override:
             self.custom_payment_terms = None
 
-        # D. Validate unique email only if it is provided (standard Django model cleaning)
-        if self.email:
-            # Check for existing email case-insensitively, excluding the current client (for edits)
-            if Client.objects.filter(Q(email__iexact=self.email.strip()) & ~Q(pk=self.pk)).exists():
-                 raise ValidationError(
-                        {'email': "A client with this email address already exists."}
-                    )
-
 
     class Meta:
         ordering = ['date_created'] 
         verbose_name = "Client"
         verbose_name_plural = "Clients"
-        
-    @property
-    def full_name(self):
-        """Returns the appropriate name based on client_type."""
-        if self.client_type == 'Company' and self.company_name:
-            return self.company_name
-        # Fallback for Individual/other types
-        return f"{self.first_name or ''} {self.last_name or ''}".strip()
+        constraints = [
+            # Case-insensitive unique email, checked by a single index probe on write
+            models.UniqueConstraint(
+                Lower('email'),
+                name=EMAIL_CONSTRAINT_NAME,
+                condition=Q(email__isnull=False),
+                violation_error_message="A client with this email address already exists.",
+            ),
+            # Individuals need a first or last name; companies need a company name
+            models.CheckConstraint(
+                condition=(
+                    Q(client_type=ClientType.COMPANY) & Q(company_name__isnull=False) & ~Q(company_name='')
+                ) | (
+                    Q(client_type=ClientType.INDIVIDUAL) & (
+                        (Q(first_name__isnull=False) & ~Q(first_name=''))
+                        | (Q(last_name__isnull=False) & ~Q(last_name=''))
+                    )
+                ),
+                name='client_name_required',
+                violation_error_message="Individual clients need a first or last name; companies need a company name.",
+            ),
+        ]
+        indexes = [
+            # Admin list_filter / list ordering and name lookups
+            models.Index(fields=['client_type', 'is_active'], name='client_type_active_idx'),
+            models.Index(fields=['-date_created'], name='client_date_created_idx'),
+            # Dashboard counts: active clients by creation date
+            models.Index(fields=['is_active', 'date_created'], name='client_active_created_idx'),
+            models.Index(fields=['last_name', 'first_name'], name='client_name_idx'),
+            models.Index(fields=['company_name'], name='client_company_name_idx'),
+            models.Index(fields=['full_name'], name='client_full_name_idx'),
+        ]
         
     def __str__(self):
         return self.full_name
@@ -237,6 +387,9 @@ class Vehicle(models.Model):
         ('4x4/4WD', '4x4 / Four-Wheel Drive (4WD)'),
     ]
 
+    # Django-side CASCADE on purpose: JobCard.vehicle is PROTECT, which a DB-level
+    # ON DELETE CASCADE would bypass. The collector already removes all of a
+    # client's vehicles with one batched DELETE, not one query per vehicle.
     client = models.ForeignKey(
         Client, 
         on_delete=models.CASCADE, 
@@ -249,6 +402,7 @@ class Vehicle(models.Model):
         max_length=100, 
         blank=True, 
         null=True, 
+        validators=[validate_vin_check_digit],
         help_text="Vehicle Identification Number"
     )
     
@@ -347,10 +501,18 @@ class Vehicle(models.Model):
     last_service_date = models.DateField(null=True, blank=True)
     date_created = models.DateTimeField(auto_now_add=True)
 
+    objects = VehicleManager()
+
     class Meta:
         ordering = ['make', 'model']
         verbose_name = "Vehicle"
         verbose_name_plural = "Vehicles"
+        indexes = [
+            # Default ordering, per-client listing and admin list_filter
+            models.Index(fields=['make', 'model'], name='vehicle_make_model_idx'),
+            models.Index(fields=['client', '-date_created'], name='vehicle_client_created_idx'),
+            models.Index(fields=['year'], name='vehicle_year_idx'),
+        ]
         
     def __str__(self):
         return f"{self.year or 'N/A'} {self.make or 'Unknown'} {self.model or 'Vehicle'} ({self.license_plate or 'No Plate'})"
\ No newline at end of file
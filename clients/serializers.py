@@ -1,8 +1,12 @@
 from rest_framework import serializers
-from .models import Client, Vehicle, DEFAULT_VAT_RATE, DEFAULT_DISCOUNT_RATE 
+from drf_serializer_cache import SerializerCacheMixin
+from .models import Client, ClientType, Vehicle, DEFAULT_VAT_RATE, DEFAULT_DISCOUNT_RATE, is_duplicate_email_error
 from django.core import validators 
-from django.core.exceptions import ValidationError 
+from django.db import IntegrityError, transaction
+from django.db.models import Prefetch
 from django.utils.translation import gettext_lazy as _ 
+from garage_ari_project.fields import CentsField
+from . import fast_fields
 import json # NEW: Used for safely parsing boolean/decimal strings from CSV
 
 # 🛑 DJOSER/USER IMPORTS (Crucial for My Account Profile)
@@ -12,6 +16,50 @@ from django.contrib.auth import get_user_model
 # Get the active User model (handles custom user models)
 User = get_user_model() 
 
+# Model introspection done once at import instead of per serializer class body
+_PHONE_VALIDATORS = tuple(Client._meta.get_field('phone_number').validators)
+
+# Validated-data keys that validate() has rules for; updates touching none of them skip it
+_VALIDATED_KEYS = frozenset({
+    'client_type', 'first_name', 'last_name', 'company_name',
+    'labor_rate_override', 'custom_labor_rate_cents',
+    'parts_markup_override', 'custom_markup_bps',
+    'payment_terms_override', 'custom_payment_terms',
+})
+
+# Validated-data keys the name rules depend on
+_NAME_KEYS = frozenset({'client_type', 'first_name', 'last_name', 'company_name'})
+
+# Override toggles and the value each one requires:
+# (flag field, validated-data key, API field name, error message)
+_OVERRIDE_RULES = (
+    ('labor_rate_override', 'custom_labor_rate_cents', 'custom_labor_rate',
+     _("A custom labor rate must be provided if the labor rate override is checked.")),
+    ('parts_markup_override', 'custom_markup_bps', 'custom_markup_percentage',
+     _("A custom markup percentage must be provided if the parts markup override is checked.")),
+    ('payment_terms_override', 'custom_payment_terms', 'custom_payment_terms',
+     _("Custom payment terms must be provided if the payment terms override is checked.")),
+)
+
+# CSV import: boolean columns and the spellings accepted for them
+_IMPORT_BOOLEAN_FIELDS = (
+    'is_tax_exempt', 'apply_discount',
+    'labor_rate_override', 'parts_markup_override', 'payment_terms_override',
+)
+_BOOL_MAP = {
+    'true': True, '1': True, 'yes': True,
+    'false': False, '0': False, 'no': False, '': False,
+}
+
+
+def _coalesce(data, instance, name):
+    """The submitted value, else the stored one, else '' (for name fields)."""
+    value = data.get(name)
+    if value is None and instance is not None:
+        value = getattr(instance, name, None)
+    return value or ''
+
+
 # ----------------------------------
 # 0. User Serializer (For Djoser's /users/me/ endpoint)
 # ----------------------------------
@@ -33,8 +81,10 @@ class CustomUserSerializer(UserSerializer):
 # 1. Vehicle Serializer (FIXED - VIN Uniqueness REMOVED)
 # ----------------------------------
 
-class VehicleSerializer(serializers.ModelSerializer):
-    client_name = serializers.CharField(source='client.full_name', read_only=True)
+class VehicleSerializer(SerializerCacheMixin, serializers.ModelSerializer):
+    # Nested under ClientDetailSerializer the owner's name comes from the context;
+    # standalone it is read from the (JOINed) client.
+    client_name = serializers.SerializerMethodField()
     
     # 🛑 FIX: Make client field optional and read-only for nested routes
     client = serializers.PrimaryKeyRelatedField(
@@ -53,6 +103,9 @@ class VehicleSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['id', 'client_name']
 
+    def get_client_name(self, obj):
+        return self.context.get('client_full_name') or obj.client.full_name
+
     def validate(self, data):
         """
         Custom validation for vehicle data - ALLOWS DUPLICATE VINs
@@ -103,52 +156,56 @@ class VehicleSerializer(serializers.ModelSerializer):
 # 2. Client Detail Serializer (Handles Conditional Validation and Settings)
 # ----------------------------------
 
-class ClientDetailSerializer(serializers.ModelSerializer):
+class ClientDetailSerializer(SerializerCacheMixin, serializers.ModelSerializer):
     """
     Serializer for the Client detail view, including all related vehicles and settings.
     Handles conditional validation for Individual vs. Company names.
+    Flat declared fields come from fast_fields (shallow-copied per instantiation).
     """
     vehicles = VehicleSerializer(many=True, read_only=True)
     
     # --- IDENTITY FIELDS (Must be optional/nullable) ---
-    first_name = serializers.CharField(max_length=100, allow_blank=True, allow_null=True, required=False)
-    last_name = serializers.CharField(max_length=100, allow_blank=True, allow_null=True, required=False)
-    company_name = serializers.CharField(max_length=255, allow_blank=True, allow_null=True, required=False)
+    first_name = fast_fields.CharField(max_length=100, allow_blank=True, allow_null=True, required=False)
+    last_name = fast_fields.CharField(max_length=100, allow_blank=True, allow_null=True, required=False)
+    company_name = fast_fields.CharField(max_length=255, allow_blank=True, allow_null=True, required=False)
     
     # --- CONTACT & METADATA ---
-    phone_number = serializers.CharField(
+    phone_number = fast_fields.CharField(
         max_length=20, allow_blank=True, allow_null=True, required=False, 
-        validators=Client._meta.get_field('phone_number').validators
+        validators=_PHONE_VALIDATORS
     )
-    tax_id = serializers.CharField(max_length=50, allow_blank=True, allow_null=True, required=False)
-    notes = serializers.CharField(
+    tax_id = fast_fields.CharField(max_length=50, allow_blank=True, allow_null=True, required=False)
+    notes = fast_fields.CharField(
         style={'base_template': 'textarea.html'}, 
         allow_blank=True, allow_null=True, required=False
     )
     
     # Email is REQUIRED by the front-end and should be required here
-    email = serializers.EmailField(
+    email = fast_fields.EmailField(
         max_length=255, required=True, allow_null=False, allow_blank=False,  
     )
 
     # ----------------------------------------------------
     # NEW SETTINGS FIELDS ADDED
     # ----------------------------------------------------
-    is_tax_exempt = serializers.BooleanField(required=False)
-    apply_discount = serializers.BooleanField(required=False)
+    # The custom_* values are always present (the settings form binds to them) but are
+    # NULL whenever their toggle is off (Client.nullify_unused_fields), and DRF emits
+    # None for a NULL attribute without running the field's formatting.
+    is_tax_exempt = fast_fields.BooleanField(required=False)
+    apply_discount = fast_fields.BooleanField(required=False)
     
-    labor_rate_override = serializers.BooleanField(required=False)
-    custom_labor_rate = serializers.DecimalField(
-        max_digits=8, decimal_places=2, required=False, allow_null=True
+    labor_rate_override = fast_fields.BooleanField(required=False)
+    custom_labor_rate = CentsField(
+        source='custom_labor_rate_cents', max_digits=8, min_value=0, required=False, allow_null=True
     )
     
-    parts_markup_override = serializers.BooleanField(required=False)
-    custom_markup_percentage = serializers.DecimalField(
-        max_digits=5, decimal_places=2, required=False, allow_null=True
+    parts_markup_override = fast_fields.BooleanField(required=False)
+    custom_markup_percentage = CentsField(
+        source='custom_markup_bps', max_digits=5, min_value=0, required=False, allow_null=True
     )
     
-    payment_terms_override = serializers.BooleanField(required=False)
-    custom_payment_terms = serializers.CharField(
+    payment_terms_override = fast_fields.BooleanField(required=False)
+    custom_payment_terms = fast_fields.CharField(
         max_length=50, required=False, allow_blank=True, allow_null=True
     )
 
@@ -172,41 +229,58 @@ class ClientDetailSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['id', 'full_name', 'date_created']
         
+    def to_representation(self, instance):
+        # Every nested vehicle belongs to this client: hand its name down once
+        self.context['client_full_name'] = instance.full_name
+        return super().to_representation(instance)
+
+    @classmethod
+    def setup_eager_loading(cls, queryset):
+        """
+        Prefetches the nested vehicles in one IN query, loading only the columns
+        VehicleSerializer reads (the owning client is attached by the prefetch).
+        """
+        return queryset.prefetch_related(
+            Prefetch('vehicles', queryset=Vehicle.objects.defer('date_created'))
+        )
         
     def validate(self, data):
         """
         Custom validation to enforce conditional required fields 
         based on the client_type, and checks override fields.
         """
-        instance_type = self.instance.client_type if self.instance else 'Individual'
+        # An update that only touches e.g. notes/phone can't break these rules
+        if self.instance is not None and _VALIDATED_KEYS.isdisjoint(data):
+            return data
+
+        instance_type = self.instance.client_type if self.instance else ClientType.INDIVIDUAL
         client_type = data.get('client_type', instance_type)
+        # On updates only the rules whose inputs were submitted are re-checked;
+        # the stored values already passed them
+        creating = self.instance is None
+        check_names = creating or not _NAME_KEYS.isdisjoint(data)
         
-        def get_field_value(field_name):
-            value = data.get(field_name)
-            if value is None and self.instance and hasattr(self.instance, field_name):
-                value = getattr(self.instance, field_name)
-            return value if value is not None else ''
+        # Every failing rule is reported in one response instead of one per retry
+        errors = {}
 
         # --- 1. Validation and Data Cleansing for Names ---
-        if client_type == 'Individual':
-            first_name = get_field_value('first_name').strip()
-            last_name = get_field_value('last_name').strip()
+        if check_names and client_type == ClientType.INDIVIDUAL:
+            first_name = _coalesce(data, self.instance, 'first_name').strip()
+            last_name = _coalesce(data, self.instance, 'last_name').strip()
 
             if not first_name and not last_name:
-                raise serializers.ValidationError({
-                    'first_name': _("Must provide at least a First Name or a Last Name for an Individual client."),
-                })
+                errors['first_name'] = [_("Must provide at least a First Name or a Last Name for an Individual client.")]
             
             data['company_name'] = None 
             
             if 'first_name' in data: data['first_name'] = first_name
             if 'last_name' in data: data['last_name'] = last_name
 
-        elif client_type == 'Company':
-            company_name = get_field_value('company_name').strip()
+        elif check_names and client_type == ClientType.COMPANY:
+            company_name = _coalesce(data, self.instance, 'company_name').strip()
 
             if not company_name:
-                raise serializers.ValidationError({"company_name": _("Company Name is required for a Company client.")})
+                errors['company_name'] = [_("Company Name is required for a Company client.")]
             
             data['first_name'] = None
             data['last_name'] = None
@@ -214,64 +288,81 @@ class ClientDetailSerializer(serializers.ModelSerializer):
             if 'company_name' in data: data['company_name'] = company_name
 
         # --- 2. Validation for Override Values ---
-        if data.get('labor_rate_override') and data.get('custom_labor_rate') is None:
-             raise serializers.ValidationError({'custom_labor_rate': _("A custom labor rate must be provided if the labor rate override is checked.")})
-             
-        if data.get('parts_markup_override') and data.get('custom_markup_percentage') is None:
-             raise serializers.ValidationError({'custom_markup_percentage': _("A custom markup percentage must be provided if the parts markup override is checked.")})
-             
-        custom_terms = get_field_value('custom_payment_terms').strip()
-        if data.get('payment_terms_override') and not custom_terms:
-             raise serializers.ValidationError({'custom_payment_terms': _("Custom payment terms must be provided if the payment terms override is checked.")})
-        
         if 'custom_payment_terms' in data:
-            data['custom_payment_terms'] = custom_terms if custom_terms else None
+            data['custom_payment_terms'] = (data['custom_payment_terms'] or '').strip() or None
 
+        for flag, key, field, message in _OVERRIDE_RULES:
+            if not creating and flag not in data and key not in data:
+                continue
+            # A submitted flag/value (even None) wins over the stored one
+            enabled = data[flag] if flag in data else getattr(self.instance, flag, False)
+            value = data[key] if key in data else getattr(self.instance, key, None)
+            if enabled and (value is None or (isinstance(value, str) and not value.strip())):
+                errors[field] = [message]
+        if errors:
+            raise serializers.ValidationError(errors)
 
-        # --- 3. Final Model Validation ---
-        try:
-            instance_data = self.instance.__dict__.copy() if self.instance else {}
-            
-            temp_data = {}
-            for k, v in data.items():
-                if k in Client._meta.get_fields() or k in self.Meta.fields:
-                    temp_data[k] = v
 
-            instance_data.update(temp_data)
-            
-            model_fields = [f.name for f in Client._meta.get_fields()]
-            model_data = {k: v for k, v in instance_data.items() if k in model_fields or k == 'pk'} 
-            
-            temp_instance = Client(**model_data)
-            temp_instance.clean() 
-            
-            data['custom_labor_rate'] = temp_instance.custom_labor_rate
-            data['custom_markup_percentage'] = temp_instance.custom_markup_percentage
-            data['custom_payment_terms'] = temp_instance.custom_payment_terms
-            
-        except ValidationError as e:
-            raise serializers.ValidationError(e.message_dict)
+        # --- 3. Model rules ---
+        # Client.clean() only re-checks the name/email rules validated above (and the
+        # 'client_name_required' CHECK backs them up), so no throwaway Client is built
+        # here. Unused override values are cleared on save (see clients/signals.py).
 
         return data
 
+    # --- 4. Email uniqueness (enforced by the DB constraint) ---
+    def _save_or_duplicate_email_error(self, save, *args):
+        try:
+            with transaction.atomic():
+                return save(*args)
+        except IntegrityError as e:
+            # Other constraint failures are not the client's email; let them surface
+            if not is_duplicate_email_error(e):
+                raise
+            raise serializers.ValidationError({'email': [_("A client with this email address already exists.")]})
+
+    def create(self, validated_data):
+        return self._save_or_duplicate_email_error(super().create, validated_data)
+
+    def update(self, instance, validated_data):
+        return self._save_or_duplicate_email_error(super().update, instance, validated_data)
+
 
 # ----------------------------------
 # 3. Client List Serializer (Simple)
 # ----------------------------------
 
-class ClientListSerializer(serializers.ModelSerializer):
+class ClientListSerializer(serializers.Serializer):
     """
     Simplified serializer for the Client list view (for faster loading).
+    Reads plain dict rows from .values() (see setup_eager_loading), so no Client
+    instances are built; only date_created needs formatting.
     """
-    full_name = serializers.CharField(read_only=True) 
+    FIELDS = (
+        'id', 'full_name', 'email', 'phone_number', 'client_type',
+        'address', 'city', 'state', 'tax_id', 'notes', 'date_created',
+    )
 
-    class Meta:
-        model = Client
-        fields = [
-            'id', 'full_name', 'email', 'phone_number', 'client_type', 
-            'address', 'city', 'state', 'tax_id', 'notes', 'date_created'
-        ]
-        read_only_fields = ['id', 'full_name', 'date_created']
+    id = serializers.IntegerField(read_only=True)
+    full_name = serializers.CharField(read_only=True)
+    email = serializers.EmailField(read_only=True)
+    phone_number = serializers.CharField(read_only=True)
+    client_type = serializers.ChoiceField(choices=ClientType.choices, read_only=True)
+    address = serializers.CharField(read_only=True)
+    city = serializers.CharField(read_only=True)
+    state = serializers.CharField(read_only=True)
+    tax_id = serializers.CharField(read_only=True)
+    notes = serializers.CharField(read_only=True)
+    date_created = serializers.DateTimeField(read_only=True)
+
+    @classmethod
+    def setup_eager_loading(cls, queryset):
+        """Fetches dict rows with exactly the listed columns, in output order."""
+        return queryset.values(*cls.FIELDS)
+
+    def to_representation(self, row):
+        row['date_created'] = self.fields['date_created'].to_representation(row['date_created'])
+        return row
         
         
 # ----------------------------------
@@ -285,6 +376,12 @@ class ClientImportSerializer(serializers.ModelSerializer):
     """
     
     email = serializers.EmailField(max_length=255, required=True, allow_null=False, allow_blank=False)
+    custom_labor_rate = CentsField(
+        source='custom_labor_rate_cents', max_digits=8, min_value=0, required=False, allow_null=True
+    )
+    custom_markup_percentage = CentsField(
+        source='custom_markup_bps', max_digits=5, min_value=0, required=False, allow_null=True
+    )
     
     class Meta:
         model = Client
@@ -302,21 +399,27 @@ class ClientImportSerializer(serializers.ModelSerializer):
     def validate(self, data):
         """Minimal validation for import: check for name, type, and uniqueness."""
         
-        client_type = data.get('client_type', 'Individual')
+        client_type = data.get('client_type', ClientType.INDIVIDUAL)
         first_name = data.get('first_name') or ''
         last_name = data.get('last_name') or ''
         company_name = data.get('company_name') or ''
         
         # 1. Enforce naming rules based on type
-        if client_type == 'Individual' and not (first_name.strip() or last_name.strip()):
+        if client_type == ClientType.INDIVIDUAL and not (first_name.strip() or last_name.strip()):
             raise serializers.ValidationError({"client_type": _("Individual clients must have a First Name or Last Name.")})
         
-        if client_type == 'Company' and not company_name.strip():
+        if client_type == ClientType.COMPANY and not company_name.strip():
             raise serializers.ValidationError({"client_type": _("Company clients must have a Company Name.")})
             
-        # 2. Check for existing client by email (uniqueness)
-        if data.get('email') and Client.objects.filter(email=data['email']).exists():
-             raise serializers.ValidationError({"email": _(f"Client with email '{data['email']}' already exists.")})
+        # 2. Check for existing client by email (uniqueness, case-insensitive like the DB constraint)
+        #    The import view pre-loads the lowercased emails in one query (context['existing_emails'])
+        email = data.get('email')
+        existing_emails = self.context.get('existing_emails')
+        if email and (
+            email.lower() in existing_emails if existing_emails is not None
+            else Client.objects.filter(email__iexact=email).exists()
+        ):
+             raise serializers.ValidationError({"email": _(f"Client with email '{email}' already exists.")})
              
         # 3. Data Cleaning: Convert empty strings to None (for nullable fields) or False (for boolean fields)
         
@@ -326,29 +429,12 @@ class ClientImportSerializer(serializers.ModelSerializer):
                 data[key] = None
         
         # Boolean fields (Handle 'TRUE', 'True', '1', or empty/None)
-        for key in ['is_tax_exempt', 'apply_discount', 'labor_rate_override', 'parts_markup_override', 'payment_terms_override']:
+        for key in _IMPORT_BOOLEAN_FIELDS:
             if key in data:
-                # Use json.loads to safely parse boolean strings (e.g., 'True'/'False')
-                try:
-                    # Clean the string value before parsing
-                    value_str = str(data[key]).strip().lower()
-                    
-                    if value_str in ('true', '1'):
-                        data[key] = True
-                    elif value_str in ('false', '0', ''):
-                        data[key] = False
-                    else:
-                        # Fallback for unexpected non-empty value
-                        data[key] = bool(data[key])
-                except Exception:
-                    # Treat any parsing error or unexpected string as False
-                    data[key] = False
+                value = data[key]
+                # Unexpected non-empty values fall back to their truthiness
+                data[key] = _BOOL_MAP.get('' if value is None else str(value).strip().lower(), bool(value))
             else:
                  data[key] = False # Default to False if field is missing in CSV
-                 
-        # Decimal fields (Convert empty strings to None)
-        for key in ['custom_labor_rate', 'custom_markup_percentage']:
-            if key in data and data[key] == '':
-                data[key] = None
 
         return data
\ No newline at end of file
@@ -0,0 +1,37 @@
+# clients/signals.py
+
+from functools import partial
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+
+from jobcards.models import JobCard
+from .models import Client, Vehicle
+from .cache_keys import DASHBOARD_CACHE_KEY
+
+
+@receiver(pre_save, sender=Client)
+def nullify_unused_client_fields(sender, instance, **kwargs):
+    """
+    Clears unused name/override fields right before the row is written, so the
+    cleanup runs once per save instead of on every clean()/full_clean() call.
+    """
+    instance.nullify_unused_fields()
+
+
+@receiver(post_save, sender=Client)
+@receiver(post_delete, sender=Client)
+@receiver(post_save, sender=Vehicle)
+@receiver(post_delete, sender=Vehicle)
+@receiver(post_save, sender=JobCard)
+@receiver(post_delete, sender=JobCard)
+def evict_dashboard_metrics(sender, instance, **kwargs):
+    """
+    Drops the cached dashboard metrics (DashboardMetricsView) after a counted row
+    changes and the write commits. Job totals are written later in the same
+    transaction with .update(), which sends no signal, so evicting right away
+    could let a concurrent poll re-cache the old totals.
+    """
+    transaction.on_commit(partial(cache.delete, DASHBOARD_CACHE_KEY))
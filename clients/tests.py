@@ -1,3 +1,299 @@
-from django.test import TestCase
+from decimal import Decimal
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import IntegrityError, connection, transaction
+from django.db.migrations.executor import MigrationExecutor
+from django.test import SimpleTestCase, TestCase, TransactionTestCase
+from rest_framework import serializers
+from rest_framework.test import APIClient
+
+from garage_ari_project.fields import CentsField
+from .models import Client, ClientType, Vehicle, is_duplicate_email_error, validate_vin_check_digit
+
+
+class StaffAPITestCase(TestCase):
+    """Authenticated APIClient as self.api."""
+
+    def setUp(self):
+        user = get_user_model().objects.create_user(email='staff@example.com', password='x')
+        self.api = APIClient()
+        self.api.force_authenticate(user)
+
+
+class ClientBulkTests(StaffAPITestCase):
+    """POST /api/clients/bulk/ takes the same field names and units as the detail endpoint."""
+
+    def post_bulk(self, rows):
+        return self.api.post('/api/clients/bulk/', rows, format='json')
+
+    def test_decimal_override_values_are_stored_in_hundredths(self):
+        response = self.post_bulk([{
+            'first_name': 'Jane', 'email': 'jane@example.com',
+            'labor_rate_override': True, 'custom_labor_rate': '45.50',
+            'parts_markup_override': True, 'custom_markup_percentage': '12.5',
+        }])
+        self.assertEqual(response.status_code, 201, response.content)
+        self.assertEqual(response.json(), {'created_count': 1})
+        client = Client.objects.get()
+        self.assertEqual((client.custom_labor_rate_cents, client.custom_markup_bps), (4550, 1250))
+
+    def test_invalid_rows_are_reported_by_index_and_nothing_is_created(self):
+        response = self.post_bulk([
+            {'first_name': 'Jane', 'email': 'jane@example.com'},
+            'not an object',
+            {'email': 'nameless@example.com'},
+            {'first_name': 'Joe', 'email': 'joe@example.com', 'custom_labor_rate': '-1'},
+        ])
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            sorted(response.json()['detailed_errors']),
+            ['1.non_field_errors', '2.first_name', '3.custom_labor_rate'],
+        )
+        self.assertFalse(Client.objects.exists())
+
+    def test_non_list_body_is_rejected(self):
+        response = self.post_bulk({'first_name': 'Jane', 'email': 'jane@example.com'})
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(Client.objects.exists())
+
+    def test_case_variant_duplicate_email_is_rejected(self):
+        Client.objects.create(first_name='Jane', email='jane@example.com')
+        response = self.post_bulk([{'first_name': 'Other', 'email': 'JANE@example.com'}])
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('email', response.json()['detail'])
+        self.assertEqual(Client.objects.count(), 1)
+
+
+class VehicleBulkTests(StaffAPITestCase):
+    """POST /api/clients/{id}/vehicles/bulk/ attaches every row to the client in the URL."""
+
+    def setUp(self):
+        super().setUp()
+        self.client_obj = Client.objects.create(first_name='Jane', email='jane@example.com')
+
+    def post_bulk(self, rows, client_pk=None):
+        return self.api.post(f'/api/clients/{client_pk or self.client_obj.pk}/vehicles/bulk/', rows, format='json')
+
+    def test_rows_are_attached_to_the_url_client(self):
+        response = self.post_bulk([{'make': 'Toyota', 'vin': '1M8GDM9AXKP042788'}, {'make': 'Isuzu'}])
+        self.assertEqual(response.status_code, 201, response.content)
+        self.assertEqual(response.json(), {'created_count': 2})
+        self.assertEqual(self.client_obj.vehicles.count(), 2)
+
+    def test_invalid_rows_are_reported_by_index(self):
+        other = Client.objects.create(first_name='Joe', email='joe@example.com')
+        response = self.post_bulk([
+            {'make': 'Toyota', 'vin': '1M8GDM9A1KP042788'},
+            ['not', 'an', 'object'],
+            {'make': 'Isuzu', 'client': other.pk},
+            {'make': 'Isuzu', 'colour': 'red'},
+        ])
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            sorted(response.json()['detailed_errors']),
+            ['0.vin', '1', '2.client', '3.colour'],
+        )
+        self.assertFalse(Vehicle.objects.exists())
+
+    def test_unknown_client(self):
+        self.assertEqual(self.post_bulk([{'make': 'Toyota'}], client_pk=999999).status_code, 400)
+
+
+class ClientImportTests(StaffAPITestCase):
+    """CSV import validates in batches, reports data rows by file line and is all-or-nothing."""
+
+    def import_csv(self, text):
+        upload = SimpleUploadedFile('clients.csv', text.encode('utf-8'), content_type='text/csv')
+        return self.api.post('/api/clients/import/', {'file': upload}, format='multipart')
+
+    def test_rows_are_imported_across_batches(self):
+        with mock.patch('clients.views.BULK_BATCH_SIZE', 2):
+            response = self.import_csv(
+                'First Name,Last Name,Email,Labor Rate Override,Custom Labor Rate\n'
+                'Jane,Doe,jane@example.com,yes,45.50\n'
+                'Joe,,joe@example.com,0,\n'
+                ',Smith,smith@example.com,no,\n'
+            )
+        self.assertEqual(response.status_code, 201, response.content)
+        self.assertEqual(response.json()['imported_count'], 3)
+        jane = Client.objects.get(email='jane@example.com')
+        self.assertEqual((jane.labor_rate_override, jane.custom_labor_rate_cents), (True, 4550))
+
+    def test_errors_name_the_file_line_and_nothing_is_imported(self):
+        Client.objects.create(first_name='Existing', email='existing@example.com')
+        with mock.patch('clients.views.BULK_BATCH_SIZE', 2):
+            response = self.import_csv(
+                'first_name,email,client_type\n'
+                'Jane,jane@example.com,Individual\n'     # line 2: fine
+                'Jane,JANE@example.com,Individual\n'     # line 3: duplicate within the file
+                'Joe,EXISTING@example.com,Individual\n'  # line 4: already on file (next batch)
+                ',acme@example.com,Company\n'            # line 5: company without a name
+                'Ann,not-an-email,Individual\n'          # line 6: bad email
+            )
+        self.assertEqual(response.status_code, 400)
+        errors = {row['line']: row['errors'] for row in response.json()['detailed_errors']}
+        self.assertEqual(sorted(errors), [3, 4, 5, 6])
+        self.assertIn('email', errors[3])
+        self.assertIn('email', errors[4])
+        self.assertIn('client_type', errors[5])
+        self.assertIn('email', errors[6])
+        self.assertEqual(Client.objects.count(), 1)
+
+    def test_missing_file(self):
+        response = self.api.post('/api/clients/import/', {}, format='multipart')
+        self.assertEqual(response.status_code, 400)
+
+
+class DashboardMetricsETagTests(StaffAPITestCase):
+    """The dashboard answers 304 for an unchanged payload and a new ETag once a write commits."""
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+
+    def get_metrics(self, etag=None):
+        headers = {'HTTP_IF_NONE_MATCH': etag} if etag else {}
+        return self.api.get('/api/dashboard/metrics/', **headers)
+
+    def test_not_modified_until_a_client_is_added(self):
+        first = self.get_metrics()
+        self.assertEqual(first.status_code, 200)
+        etag = first['ETag']
+
+        not_modified = self.get_metrics(etag)
+        self.assertEqual(not_modified.status_code, 304)
+        self.assertEqual(not_modified['ETag'], etag)
+        self.assertFalse(not_modified.content)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Client.objects.create(first_name='Jane', email='jane@example.com')
+        changed = self.get_metrics(etag)
+        self.assertEqual(changed.status_code, 200)
+        self.assertNotEqual(changed['ETag'], etag)
+
+
+class VinCheckDigitTests(SimpleTestCase):
+    """The position-9 check digit is verified for North American VINs only."""
+
+    def test_valid_north_american_vins(self):
+        for vin in ('1M8GDM9AXKP042788', '11111111111111111', '1m8gdm9axkp042788 '):
+            validate_vin_check_digit(vin)
+
+    def test_wrong_check_digit(self):
+        with self.assertRaisesMessage(ValidationError, 'check digit'):
+            validate_vin_check_digit('1M8GDM9A1KP042788')
+
+    def test_letters_a_vin_cannot_contain(self):
+        for vin in ('1M8GDM9AXKP04278O', '1M8GDM9AXKP0427Q8', '1M8GDM9AXKP0427-8'):
+            with self.assertRaisesMessage(ValidationError, 'invalid characters'):
+                validate_vin_check_digit(vin)
+
+    def test_other_markets_and_lengths_are_not_checked(self):
+        # European/Asian WMIs, short chassis numbers and blanks have no mandatory check digit
+        for vin in ('WVWZZZ1JZXW000001', 'JH4KA8260MC000000', 'SALLAAA146A000000', '1M8GDM9AXKP0427', '', None):
+            validate_vin_check_digit(vin)
+
+
+class CentsFieldTests(SimpleTestCase):
+    """CentsField reads two-decimal strings into hundredths and writes them back unchanged."""
+
+    field = CentsField(max_digits=8, min_value=0)
+
+    def test_round_trip(self):
+        for text, hundredths in (('45.50', 4550), ('0.05', 5), ('0.00', 0), ('123456.78', 12345678)):
+            self.assertEqual(self.field.to_internal_value(text), hundredths)
+            self.assertEqual(self.field.to_representation(hundredths), text)
+
+    def test_input_forms(self):
+        self.assertEqual(self.field.to_internal_value('12.5'), 1250)
+        self.assertEqual(self.field.to_internal_value(7), 700)
+        self.assertEqual(self.field.to_internal_value(Decimal('1.1')), 110)
+
+    def test_rejects_extra_precision_and_range(self):
+        for value in ('1.005', '-1', '1234567.00', 'abc'):
+            with self.assertRaises(serializers.ValidationError):
+                self.field.run_validation(value)
+
+
+class DuplicateEmailErrorTests(TestCase):
+    """Only the email constraint's IntegrityError is reported as a duplicate email."""
+
+    def integrity_error(self, **fields):
+        with self.assertRaises(IntegrityError) as caught, transaction.atomic():
+            Client.objects.create(**fields)
+        return caught.exception
+
+    def test_email_constraint(self):
+        Client.objects.create(first_name='Jane', email='jane@example.com')
+        self.assertTrue(is_duplicate_email_error(self.integrity_error(first_name='Jo', email='JANE@example.com')))
+
+    def test_other_constraints(self):
+        error = self.integrity_error(client_type=ClientType.COMPANY, email='acme@example.com')
+        self.assertIn('client_name_required', str(error))
+        self.assertFalse(is_duplicate_email_error(error))
+
+
+class EmailConstraintMigrationTests(TransactionTestCase):
+    """0010 refuses to build the case-insensitive email index over case-variant duplicates."""
+
+    before = [('clients', '0009_remove_vehicle_odometer_vehicle_color_and_more')]
+    after = [('clients', '0010_client_client_email_ci_unique')]
+
+    def setUp(self):
+        self.executor = MigrationExecutor(connection)
+        self.executor.migrate(self.before)
+        self.executor.loader.build_graph()
+        self.Client = self.executor.loader.project_state(self.before).apps.get_model('clients', 'Client')
+
+    def tearDown(self):
+        self.Client.objects.all().delete()
+        executor = MigrationExecutor(connection)
+        executor.migrate(executor.loader.graph.leaf_nodes())
+
+    def test_case_variant_duplicates_stop_the_migration(self):
+        self.Client.objects.create(first_name='Jane', email='Jane@example.com')
+        self.Client.objects.create(first_name='Jane', email='jane@example.com')
+        with self.assertRaisesMessage(RuntimeError, 'jane@example.com'):
+            self.executor.migrate(self.after)
+
+    def test_distinct_emails_migrate(self):
+        self.Client.objects.create(first_name='Jane', email='jane@example.com')
+        self.Client.objects.create(first_name='Joe', email='joe@example.com')
+        self.executor.migrate(self.after)
+
+
+class OverrideHundredthsMigrationTests(TransactionTestCase):
+    """0015 moves the decimal override columns to cents/basis points and back."""
+
+    before = [('clients', '0014_client_client_name_required')]
+    after = [('clients', '0015_client_override_hundredths')]
+
+    def migrate(self, targets):
+        executor = MigrationExecutor(connection)
+        executor.migrate(targets)
+        return executor.loader.project_state(targets).apps
+
+    def tearDown(self):
+        self.migrate(MigrationExecutor(connection).loader.graph.leaf_nodes())
+        Client.objects.all().delete()
+
+    def test_round_trip(self):
+        apps = self.migrate(self.before)
+        HistoricalClient = apps.get_model('clients', 'Client')
+        pk = HistoricalClient.objects.create(
+            first_name='Jane', email='jane@example.com',
+            custom_labor_rate=Decimal('45.50'), custom_markup_percentage=Decimal('12.05'),
+        ).pk
+        HistoricalClient.objects.create(first_name='Joe', email='joe@example.com')
+
+        apps = self.migrate(self.after)
+        rows = apps.get_model('clients', 'Client').objects.order_by('pk').values_list('custom_labor_rate_cents', 'custom_markup_bps')
+        self.assertEqual(list(rows), [(4550, 1205), (None, None)])
+
+        apps = self.migrate(self.before)
+        client = apps.get_model('clients', 'Client').objects.get(pk=pk)
+        self.assertEqual((client.custom_labor_rate, client.custom_markup_percentage), (Decimal('45.50'), Decimal('12.05')))
@@ -1,39 +1,132 @@
+import codecs
 import csv 
-from django.http import HttpResponse 
+from itertools import islice
+from django.http import StreamingHttpResponse
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated 
-from rest_framework.pagination import PageNumberPagination
+from rest_framework.pagination import CursorPagination
 from rest_framework import viewsets, mixins, filters, status, serializers  # 🛑 ADDED serializers here
 from rest_framework.decorators import action 
 from rest_framework.parsers import MultiPartParser, FormParser 
 
-from django.db.models import Sum 
+from django.db.models import Count, Q, Sum 
+from django.db.models.functions import Lower
 from django.utils import timezone
-from django.db import transaction 
+from django.core.cache import cache
+from django.db import IntegrityError, transaction 
+from django.core.exceptions import ValidationError as DjangoValidationError
 from datetime import timedelta
 from dateutil.relativedelta import relativedelta 
 
 # Import Models from the client app
-from .models import Client, Vehicle
+from .cache_keys import DASHBOARD_CACHE_KEY, DASHBOARD_CACHE_TIMEOUT
+from .models import BULK_BATCH_SIZE, Client, Vehicle, is_duplicate_email_error
 # Import the new ClientImportSerializer
 from .serializers import ClientListSerializer, ClientDetailSerializer, VehicleSerializer, ClientImportSerializer
 
 # CRITICAL IMPORT FOR METRICS
 from jobcards.models import JobCard 
+from garage_ari_project.etags import etag_response
+from garage_ari_project.fields import format_hundredths
 
 # Helper function to calculate percentage change
 def calculate_percentage_change(current, previous):
     if previous == 0:
-        return '+100.0%' if current > 0 else '+0.0%'
-    
-    change_ratio = (current - previous) / previous
-    percentage = round(change_ratio * 100, 1)
-    return f"{'+' if percentage >= 0 else ''}{percentage:.1f}%"
+        percentage = 100.0 if current > 0 else 0.0
+    else:
+        # `or 0.0` turns a rounded -0.0 into +0.0
+        percentage = round((current - previous) / previous * 100, 1) or 0.0
+    # The '+' format flag signs the value, so no sign branch is needed
+    return f"{percentage:+.1f}%"
+
+def _clean_csv_rows(reader):
+    """
+    Yields (line number, raw row, cleaned row) for each CSV data row. The cleaned
+    row drops unmappable columns and turns blank values into None.
+    """
+    for line_number, row in enumerate(reader, start=2):
+        clean_row = {
+            k: (v.strip() if isinstance(v, str) and v.strip() != '' else None)
+            for k, v in row.items() 
+            if k is not None # Ignore rows with unmappable headers
+        }
+        yield line_number, dict(row), clean_row
+
+class _Echo:
+    """File-like object whose write() returns the line, for streaming csv.writer output."""
+    def write(self, value):
+        return value
 
 # ----------------------------------
 # 0. Dashboard Metrics API View 
 # ----------------------------------
+
+
+def _compute_dashboard_metrics():
+    """Runs the dashboard count/sum queries and returns the response payload."""
+    now = timezone.now()
+    
+    start_of_current_month = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    start_of_previous_month = start_of_current_month - relativedelta(months=1)
+
+    # Each table is read once; the per-period numbers are conditional aggregates.
+    this_month = Q(date_created__gte=start_of_current_month)
+    last_month = Q(date_created__gte=start_of_previous_month, date_created__lt=start_of_current_month)
+
+    # --- 1. Total Clients & Percentage Change & STATUS ALERT ---
+    client_counts = Client.objects.filter(is_active=True).aggregate(
+        total=Count('id'),
+        current=Count('id', filter=this_month),
+        previous=Count('id', filter=last_month),
+    )
+    total_clients = client_counts['total']
+    client_status_alert = 'RED_ALERT' if total_clients < 5 else 'OK'
+    client_change = calculate_percentage_change(client_counts['current'], client_counts['previous'])
+
+    # --- 2. Total Vehicles ---
+    total_vehicles = Vehicle.objects.count()
+
+    # --- 3 & 4. Sales (Revenue This Month) and Appointments (Upcoming 7 Days), with MoM Change ---
+    next_seven_days = now + timedelta(days=7)
+    paid = Q(status='PAID')
+    job_stats = JobCard.objects.aggregate(
+        current_revenue=Sum('total_due', filter=paid & Q(date_completed__gte=start_of_current_month)),
+        previous_revenue=Sum('total_due', filter=paid & Q(
+            date_completed__gte=start_of_previous_month, date_completed__lt=start_of_current_month
+        )),
+        upcoming=Count('id', filter=Q(
+            date_in__range=[now, next_seven_days], status__in=['OPEN', 'IN_PROGRESS']
+        )),
+        current_appointments=Count('id', filter=Q(date_in__gte=start_of_current_month)),
+        previous_appointments=Count('id', filter=Q(
+            date_in__gte=start_of_previous_month, date_in__lt=start_of_current_month
+        )),
+    )
+
+    current_month_revenue = job_stats['current_revenue'] or 0
+    last_month_revenue = job_stats['previous_revenue'] or 0
+    total_sales_display = f"Tsh {current_month_revenue:,.0f}" 
+    sales_change = calculate_percentage_change(current_month_revenue, last_month_revenue)
+
+    upcoming_appointments = job_stats['upcoming']
+    appointment_change = calculate_percentage_change(
+        job_stats['current_appointments'], job_stats['previous_appointments']
+    )
+
+    data = {
+        'total_clients': total_clients,
+        'total_vehicles': total_vehicles,
+        'total_sales': total_sales_display, 
+        'total_appointments': upcoming_appointments,
+        'client_percentage_change': client_change,
+        'sales_percentage_change': sales_change,
+        'appointment_percentage_change': appointment_change, 
+        'client_status_alert': client_status_alert,
+    }
+    return data
+
+
 class DashboardMetricsView(APIView):
     """
     Returns summarized data for the main dashboard statistics.
@@ -41,77 +134,17 @@ class DashboardMetricsView(APIView):
     permission_classes = [IsAuthenticated] 
 
     def get(self, request, *args, **kwargs):
-        now = timezone.now()
-        
-        start_of_current_month = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-        start_of_previous_month = start_of_current_month - relativedelta(months=1)
+        data = cache.get_or_set(DASHBOARD_CACHE_KEY, _compute_dashboard_metrics, DASHBOARD_CACHE_TIMEOUT)
+        # The dashboard polls this endpoint; unchanged numbers are answered with a bodiless 304
+        return etag_response(request, data)
+
+class ClientCursorPagination(CursorPagination):
+    """
+    Pages clients by an opaque cursor on the indexed date_created column: each page
+    is a range seek, with no COUNT(*) and no OFFSET that grows with page depth.
+    """
+    ordering = '-date_created'
 
-        # --- 1. Total Clients & Percentage Change & STATUS ALERT ---
-        total_clients = Client.objects.filter(is_active=True).count()
-        client_status_alert = 'RED_ALERT' if total_clients < 5 else 'OK'
-        
-        current_month_new_clients = Client.objects.filter(
-            is_active=True, date_created__gte=start_of_current_month 
-        ).count()
-        last_month_new_clients = Client.objects.filter(
-            is_active=True, date_created__gte=start_of_previous_month,
-            date_created__lt=start_of_current_month 
-        ).count()
-        client_change = calculate_percentage_change(current_month_new_clients, last_month_new_clients)
-
-        # --- 2. Total Vehicles ---
-        total_vehicles = Vehicle.objects.count()
-
-        # --- 3. Total Sales Orders (Revenue This Month) & MoM Change ---
-        try:
-            current_month_sales_agg = JobCard.objects.filter(
-                status='PAID', date_completed__gte=start_of_current_month 
-            ).aggregate(total_revenue=Sum('total_due')) 
-            current_month_revenue = current_month_sales_agg.get('total_revenue') or 0
-        except Exception:
-            current_month_revenue = 0
-            
-        total_sales_display = f"Tsh {current_month_revenue:,.0f}" 
-        
-        try:
-            last_month_sales_agg = JobCard.objects.filter(
-                status='PAID', date_completed__gte=start_of_previous_month,
-                date_completed__lt=start_of_current_month
-            ).aggregate(total_revenue=Sum('total_due')) 
-            last_month_revenue = last_month_sales_agg.get('total_revenue') or 0
-        except Exception:
-            last_month_revenue = 0
-
-        sales_change = calculate_percentage_change(current_month_revenue, last_month_revenue)
-
-        # --- 4. Total Appointments (Upcoming 7 Days) & MoM Change ---
-        next_seven_days = now + timedelta(days=7)
-        
-        upcoming_appointments = JobCard.objects.filter(
-            date_in__range=[now, next_seven_days], 
-            status__in=['OPEN', 'IN_PROGRESS'] 
-        ).count()
-        
-        current_month_appointments = JobCard.objects.filter(
-            date_in__gte=start_of_current_month 
-        ).count()
-        last_month_appointments = JobCard.objects.filter(
-            date_in__gte=start_of_previous_month,
-            date_in__lt=start_of_current_month 
-        ).count()
-        appointment_change = calculate_percentage_change(current_month_appointments, last_month_appointments)
-
-        data = {
-            'total_clients': total_clients,
-            'total_vehicles': total_vehicles,
-            'total_sales': total_sales_display, 
-            'total_appointments': upcoming_appointments,
-            'client_percentage_change': client_change,
-            'sales_percentage_change': sales_change,
-            'appointment_percentage_change': appointment_change, 
-            'client_status_alert': client_status_alert,
-        }
-        return Response(data)
 
 # ----------------------------------
 # 1. Client ViewSet (with Export and Import Actions)
@@ -122,16 +155,25 @@ class ClientViewSet(viewsets.ModelViewSet):
     pagination, data export, and data import.
     """
     
-    queryset = Client.objects.filter(is_active=True).order_by('last_name')
-    pagination_class = PageNumberPagination
+    # List order comes from ClientCursorPagination (-date_created)
+    queryset = Client.objects.filter(is_active=True)
+    pagination_class = ClientCursorPagination
     filter_backends = [filters.SearchFilter]
-    search_fields = ['first_name', 'last_name', 'company_name', 'email', 'phone_number', 'tax_id', 'notes']
-    ordering_fields = ['last_name', 'date_created']
+    # full_name is the stored name column (first + last, or company name), so one
+    # LIKE covers what first_name/last_name/company_name needed three for
+    search_fields = ['full_name', 'email', 'phone_number', 'tax_id', 'notes']
     
     def get_serializer_class(self):
         if self.action == 'list':
             return ClientListSerializer
         return ClientDetailSerializer
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        serializer_class = self.get_serializer_class()
+        if hasattr(serializer_class, 'setup_eager_loading'):
+            queryset = serializer_class.setup_eager_loading(queryset)
+        return queryset
     
     def perform_destroy(self, instance):
         instance.is_active = False
@@ -140,13 +182,7 @@ class ClientViewSet(viewsets.ModelViewSet):
     # 1. CORRECTED ACTION: Export Clients to CSV
     @action(detail=False, methods=['get'])
     def export(self, request):
-        """Generates and returns a CSV file of all active client data."""
-        response = HttpResponse(
-            content_type='text/csv',
-            headers={'Content-Disposition': 'attachment; filename="clients_export.csv"'},
-        )
-        writer = csv.writer(response)
-        
+        """Streams a CSV file of all active client data."""
         # ✅ FIX: 'date_updated' is removed from the list of fields.
         field_names = [
             'id', 'first_name', 'last_name', 'company_name', 'email', 
@@ -157,16 +193,63 @@ class ClientViewSet(viewsets.ModelViewSet):
             'custom_payment_terms'
         ]
         
-        writer.writerow([field.replace('_', ' ').title() for field in field_names]) 
+        # Overrides are stored as integer hundredths; export them as decimal strings
+        stored_as = {'custom_labor_rate': 'custom_labor_rate_cents', 'custom_markup_percentage': 'custom_markup_bps'}
+        hundredths_positions = [field_names.index(field) for field in stored_as]
+        clients = Client.objects.filter(is_active=True).values_list(*[stored_as.get(f, f) for f in field_names])
 
-        clients = Client.objects.filter(is_active=True).values(*field_names)
-        
-        for client in clients:
-            row_data = [client[field] for field in field_names]
-            writer.writerow(row_data)
+        # Rows are written one at a time as the response is sent, reading the table in
+        # chunks, so memory stays flat however many clients there are
+        writer = csv.writer(_Echo())
+
+        def rows():
+            yield writer.writerow([field.replace('_', ' ').title() for field in field_names])
+            for row in clients.iterator(chunk_size=2000):
+                row = list(row)
+                for position in hundredths_positions:
+                    if row[position] is not None:
+                        row[position] = format_hundredths(row[position])
+                yield writer.writerow(row)
 
-        return response
+        return StreamingHttpResponse(
+            rows(),
+            content_type='text/csv',
+            headers={'Content-Disposition': 'attachment; filename="clients_export.csv"'},
+        )
         
+    # 1b. Bulk create from a JSON list (one multi-row INSERT per batch)
+    @action(detail=False, methods=['post'])
+    def bulk(self, request):
+        """
+        Creates many clients from a JSON list of client objects. Rows use the same
+        field names and units as the detail endpoint (e.g. custom_labor_rate as a
+        decimal string), so they are validated by ClientDetailSerializer first.
+        """
+        if not isinstance(request.data, list):
+            return Response({"error": "Expected a list of client objects."}, status=status.HTTP_400_BAD_REQUEST)
+        serializer = ClientDetailSerializer(data=request.data, many=True)
+        if not serializer.is_valid():
+            # Same "<row index>.<field>" keys as the model-level errors below. Newer DRF
+            # reports only the failing rows, keyed by index; older DRF a list of all rows.
+            errors = serializer.errors
+            rows = errors.items() if isinstance(errors, dict) else enumerate(errors)
+            detailed_errors = {
+                f"{index}.{field}": messages
+                for index, row_errors in rows
+                for field, messages in row_errors.items()
+            }
+            return Response({"error": "Bulk create failed.", "detailed_errors": detailed_errors}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            with transaction.atomic():
+                created = Client.objects.bulk_register(serializer.validated_data)
+        except DjangoValidationError as e:
+            return Response({"error": "Bulk create failed.", "detailed_errors": e.message_dict}, status=status.HTTP_400_BAD_REQUEST)
+        except IntegrityError as e:
+            if not is_duplicate_email_error(e):
+                raise
+            return Response({"error": "Bulk create failed.", "detail": "A client with one of these email addresses already exists."}, status=status.HTTP_400_BAD_REQUEST)
+        return Response({"created_count": len(created)}, status=status.HTTP_201_CREATED)
+
     # 2. 🏆 CRITICAL FIX APPLIED HERE: Renamed the method to 'import' 
     #    OR explicitly set url_path='import'. Using the latter for clarity.
     @action(
@@ -184,46 +267,58 @@ class ClientViewSet(viewsets.ModelViewSet):
         file = request.data['file']
         
         try:
-            # Read the file and decode, handling potential headers issue
-            # Using readlines() then decoding ensures line endings are handled correctly
-            file_data = file.read().decode('utf-8')
-            decoded_file = file_data.splitlines()
-            reader = csv.DictReader(decoded_file)
+            # Decode the upload line by line instead of reading it into memory whole;
+            # reading the header row here surfaces encoding errors up front
+            lines = codecs.iterdecode(file, 'utf-8')
+            # Clean headers for reliable mapping to serializer fields
+            # This is CRITICAL for robust import handling
+            header = next(csv.reader(lines), [])
+            fieldnames = [key.strip().lower().replace(' ', '_') for key in header]
+            reader = csv.DictReader(lines, fieldnames=fieldnames)
         except Exception as e:
             return Response({"error": f"Error reading or decoding file: {str(e)}"}, status=status.HTTP_400_BAD_REQUEST)
 
-        imported_clients = []
         errors = []
-        line_number = 1
-        
-        # Clean headers for reliable mapping to serializer fields
-        # This is CRITICAL for robust import handling
-        if reader.fieldnames:
-            fieldnames = [key.strip().lower().replace(' ', '_') for key in reader.fieldnames]
-            reader.fieldnames = fieldnames
+        imported_count = 0
+        rows = _clean_csv_rows(reader)
+        # Emails already on file, loaded once per batch instead of an .exists() per row;
+        # imported emails are added so duplicates within the file are caught too.
+        existing_emails = set()
+        context = {'existing_emails': existing_emails}
+        # One serializer validates every row: its fields (built from model
+        # introspection) are constructed once instead of per row
+        serializer = ClientImportSerializer(context=context)
         
         try:
             with transaction.atomic():
-                for row in reader:
-                    line_number += 1
-                    
-                    # Create a clean dictionary from the row, converting empty strings to None
-                    clean_row = {
-                        k: (v.strip() if isinstance(v, str) and v.strip() != '' else None)
-                        for k, v in row.items() 
-                        if k is not None # Ignore rows with unmappable headers
-                    }
-                    
-                    serializer = ClientImportSerializer(data=clean_row)
-                    
-                    if serializer.is_valid():
-                        imported_clients.append(serializer.save())
-                    else:
-                        errors.append({
-                            "line": line_number,
-                            "data_provided": dict(row),
-                            "errors": serializer.errors
-                        })
+                # Rows are validated and inserted BULK_BATCH_SIZE at a time, so memory
+                # stays bounded by the batch rather than the file
+                while batch := list(islice(rows, BULK_BATCH_SIZE)):
+                    emails = {(clean_row.get('email') or '').lower() for _, _, clean_row in batch} - {''}
+                    existing_emails.update(
+                        Client.objects.annotate(email_lower=Lower('email'))
+                        .filter(email_lower__in=emails)
+                        .values_list('email_lower', flat=True)
+                    )
+
+                    valid_rows = []
+                    for line_number, row, clean_row in batch:
+                        try:
+                            validated = serializer.run_validation(clean_row)
+                        except serializers.ValidationError as exc:
+                            errors.append({
+                                "line": line_number,
+                                "data_provided": row,
+                                "errors": exc.detail
+                            })
+                            continue
+                        valid_rows.append(validated)
+                        existing_emails.add(validated['email'].lower())
+
+                    # Once any row has failed the import is rolled back, so stop inserting
+                    # (but keep validating, to report every bad line)
+                    if not errors:
+                        imported_count += len(Client.objects.bulk_register(valid_rows))
                 
                 if errors:
                     # Rollback happens here due to transaction.atomic() scope ending with an exception
@@ -231,8 +326,8 @@ class ClientViewSet(viewsets.ModelViewSet):
             
             # If the atomic block completes successfully:
             return Response({
-                "message": f"Successfully imported {len(imported_clients)} new clients.",
-                "imported_count": len(imported_clients)
+                "message": f"Successfully imported {imported_count} new clients.",
+                "imported_count": imported_count
             }, status=status.HTTP_201_CREATED)
 
         except Exception as e:
@@ -268,7 +363,8 @@ class VehicleViewSet(viewsets.ModelViewSet):
         if not client_pk:
             # Return empty queryset if no client_pk (should not happen with proper URL config)
             return Vehicle.objects.none()
-        return self.queryset.filter(client_id=client_pk)
+        # JOIN the owner for client_name instead of one Client query per vehicle
+        return self.queryset.filter(client_id=client_pk).select_related('client').defer('client__notes')
         
     def perform_create(self, serializer):
         # 🏆 UPDATED: Only handle nested routes - client comes from URL
@@ -285,7 +381,24 @@ class VehicleViewSet(viewsets.ModelViewSet):
             raise serializers.ValidationError({"client": "Invalid Client ID format."})
                 
         try:
-            client = Client.objects.get(pk=client_pk_int)
+            # Confirms the owner exists; full_name is all the response reads from it (client_name)
+            client = Client.objects.only('full_name').get(pk=client_pk_int)
             serializer.save(client=client)
         except Client.DoesNotExist:
-            raise serializers.ValidationError({"client": "Client not found."})
\ No newline at end of file
+            raise serializers.ValidationError({"client": "Client not found."})
+    # Bulk attach vehicles to the client in the URL (one multi-row INSERT per batch)
+    @action(detail=False, methods=['post'])
+    def bulk(self, request, client_pk=None):
+        """Creates many vehicles for the nested client from a JSON list."""
+        if not isinstance(request.data, list):
+            return Response({"error": "Expected a list of vehicle objects."}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            client = Client.objects.only('id').get(pk=int(client_pk))
+        except (ValueError, TypeError, Client.DoesNotExist):
+            raise serializers.ValidationError({"client": "Client not found."})
+        try:
+            with transaction.atomic():
+                created = Vehicle.objects.bulk_attach(client, request.data)
+        except DjangoValidationError as e:
+            return Response({"error": "Bulk create failed.", "detailed_errors": e.message_dict}, status=status.HTTP_400_BAD_REQUEST)
+        return Response({"created_count": len(created)}, status=status.HTTP_201_CREATED)
@@ -114,4 +114,24 @@ class EmployeeSerializer(serializers.ModelSerializer):
             if isinstance(value, str) and value.strip() == "":
                 data[field_name] = None
         
-        return data
\ No newline at end of file
+        return data
+
+
+class EmployeeListSerializer(serializers.ModelSerializer):
+    """
+    Read-only summary used by the employee list. Keeps the camelCase names of
+    EmployeeSerializer but only the directory columns (no salary/bank/education).
+    """
+    firstName = serializers.CharField(source='first_name', read_only=True)
+    lastName = serializers.CharField(source='last_name', read_only=True)
+    jobTitle = serializers.CharField(source='job_title', read_only=True)
+    employmentStatus = serializers.CharField(source='employment_status', read_only=True)
+
+    # Columns the list query loads (see EmployeeViewSet.get_queryset)
+    FIELDS = ('id', 'first_name', 'last_name', 'job_title', 'department', 'employment_status', 'email')
+
+    class Meta:
+        model = Employee
+        fields = ('id', 'firstName', 'lastName', 'jobTitle', 'department', 'employmentStatus', 'email')
+        read_only_fields = fields
+
@@ -3,7 +3,7 @@
 from rest_framework import viewsets
 from rest_framework.permissions import IsAuthenticated 
 from .models import Employee
-from .serializers import EmployeeSerializer
+from .serializers import EmployeeListSerializer, EmployeeSerializer
 
 class EmployeeViewSet(viewsets.ModelViewSet):
     """
@@ -19,6 +19,18 @@ class EmployeeViewSet(viewsets.ModelViewSet):
     
     # Adjust permission_classes as needed for your project's security
     permission_classes = [IsAuthenticated]
+
+    def get_serializer_class(self):
+        if self.action == 'list':
+            return EmployeeListSerializer
+        return EmployeeSerializer
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action == 'list':
+            # The list shows a directory summary; skip the wide HR/salary columns
+            queryset = queryset.only(*EmployeeListSerializer.FIELDS)
+        return queryset
     
     # Optional: You can customize the behavior of the update method if needed, 
     # but the default ModelViewSet.update() is usually sufficient when serializers are correct.
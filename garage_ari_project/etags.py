@@ -0,0 +1,20 @@
+# garage_ari_project/etags.py
+
+import hashlib
+
+import orjson
+from django.utils.http import parse_etags, quote_etag
+from rest_framework import status
+from rest_framework.response import Response
+
+
+def etag_response(request, data):
+    """
+    Response for a polled, read-only payload with an ETag derived from its
+    content. When the client already holds that version (If-None-Match) the
+    answer is a bodiless 304 instead of the re-rendered payload.
+    """
+    etag = quote_etag(hashlib.md5(orjson.dumps(data, option=orjson.OPT_SORT_KEYS)).hexdigest())
+    if etag in parse_etags(request.headers.get('If-None-Match', '')):
+        return Response(status=status.HTTP_304_NOT_MODIFIED, headers={'ETag': etag})
+    return Response(data, headers={'ETag': etag})
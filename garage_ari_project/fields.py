@@ -0,0 +1,26 @@
+# garage_ari_project/fields.py
+
+from rest_framework import serializers
+
+
+def format_hundredths(value):
+    """Formats an integer count of hundredths (cents, basis points) as a two-decimal string."""
+    whole, fraction = divmod(abs(value), 100)
+    return f"{'-' if value < 0 else ''}{whole}.{fraction:02d}"
+
+
+class CentsField(serializers.DecimalField):
+    """
+    Two-decimal amount stored as an integer count of hundredths: money in cents,
+    or a percentage in basis points. Accepts and returns the same two-decimal
+    strings as DecimalField, but reads format the int directly instead of going
+    through Decimal quantization.
+    """
+    def __init__(self, max_digits=10, **kwargs):
+        super().__init__(max_digits=max_digits, decimal_places=2, **kwargs)
+
+    def to_internal_value(self, data):
+        return int(super().to_internal_value(data) * 100)
+
+    def to_representation(self, value):
+        return format_hundredths(value)
@@ -0,0 +1,34 @@
+# garage_ari_project/paginators.py
+
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+
+# Below this many rows an exact COUNT(*) is cheap enough and preferred.
+EXACT_COUNT_THRESHOLD = 10000
+
+
+class ApproxCountPaginator(Paginator):
+    """
+    Paginator for large, unfiltered admin changelists. On PostgreSQL the row
+    count comes from the planner estimate in pg_class instead of a full
+    COUNT(*) scan. Filtered querysets, small tables and other databases fall
+    back to the exact count.
+    """
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        connection = connections[queryset.db]
+
+        if connection.vendor == 'postgresql' and not queryset.query.where:
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    "SELECT reltuples::bigint FROM pg_class WHERE relname = %s",
+                    [queryset.model._meta.db_table],
+                )
+                row = cursor.fetchone()
+            estimate = row[0] if row else -1
+            if estimate >= EXACT_COUNT_THRESHOLD:
+                return estimate
+
+        return super().count
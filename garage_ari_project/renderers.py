@@ -0,0 +1,25 @@
+# garage_ari_project/renderers.py
+
+import orjson
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+# DRF's encoder covers what orjson doesn't natively (Decimal, lazy translation
+# strings, querysets, ...). orjson only calls it for those objects.
+_fallback_encoder = JSONEncoder()
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    Drop-in replacement for DRF's JSONRenderer that encodes with orjson (C)
+    instead of the stdlib json module.
+    """
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+
+        option = orjson.OPT_NON_STR_KEYS
+        if self.get_indent(accepted_media_type, renderer_context or {}):
+            option |= orjson.OPT_INDENT_2
+
+        return orjson.dumps(data, default=_fallback_encoder.default, option=option)
@@ -1,3 +1,4 @@
+import os
 from pathlib import Path
 from datetime import timedelta
 
@@ -87,12 +88,50 @@ WSGI_APPLICATION = 'garage_ari_project.wsgi.application'
 # 3. DATABASE, AUTH, and INTERNATIONALIZATION
 # ==============================================================================
 
-DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+# Database: PostgreSQL when POSTGRES_DB is set (requires `psycopg[pool]`), otherwise
+# the bundled SQLite file for development. SQLite serializes all writers, so a long
+# CSV import blocks every other write; Postgres does not.
+POSTGRES_DB = os.environ.get('POSTGRES_DB')
+
+if POSTGRES_DB:
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': POSTGRES_DB,
+            'USER': os.environ.get('POSTGRES_USER', ''),
+            'PASSWORD': os.environ.get('POSTGRES_PASSWORD', ''),
+            'HOST': os.environ.get('POSTGRES_HOST', 'localhost'),
+            'PORT': os.environ.get('POSTGRES_PORT', '5432'),
+            # psycopg's connection pool reuses connections across requests
+            # (Django requires CONN_MAX_AGE = 0 when pooling)
+            'OPTIONS': {'pool': True},
+        }
+    }
+else:
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': BASE_DIR / 'db.sqlite3',
+        }
+    }
+
+# Cache: Redis when REDIS_URL is set (requires the `redis` package), otherwise
+# the per-process local-memory cache for development.
+REDIS_URL = os.environ.get('REDIS_URL')
+
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
     }
-}
 
 # --- IMPORTANT: Custom User Model Setup ---
 AUTH_USER_MODEL = 'auth_app.User'
@@ -115,6 +154,15 @@ AUTH_PASSWORD_VALIDATORS = [
 ]
 
 
+# Password hashing: Argon2 (requires argon2-cffi) for new hashes. The PBKDF2
+# hashers stay listed so existing passwords still verify and get upgraded.
+PASSWORD_HASHERS = [
+    'auth_app.hashers.TunedArgon2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+]
+
+
 # Internationalization
 LANGUAGE_CODE = 'en-us'
 
@@ -146,9 +194,14 @@ REST_FRAMEWORK = {
         'rest_framework.permissions.IsAuthenticated',
     ],
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        # Narrow-row variant of simplejwt's JWTAuthentication (auth_app/authentication.py)
+        'auth_app.authentication.CustomJWTAuthentication',
         'rest_framework.authentication.SessionAuthentication', 
     ),
+    'DEFAULT_RENDERER_CLASSES': (
+        'garage_ari_project.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 10, # <-- ENSURE THIS IS 10
 }
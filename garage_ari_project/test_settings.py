@@ -0,0 +1,9 @@
+# garage_ari_project/test_settings.py
+
+# Settings for the test suite. `manage.py test` selects this module by default;
+# other runners should point DJANGO_SETTINGS_MODULE at it.
+
+from .settings import *  # noqa: F401,F403
+
+# Hashing strength is irrelevant in the test suite; keep user fixtures fast.
+PASSWORD_HASHERS = ['django.contrib.auth.hashers.MD5PasswordHasher']
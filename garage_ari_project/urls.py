@@ -10,24 +10,28 @@ urlpatterns = [
     # Admin Interface
     path('admin/', admin.site.urls),
     
-    # Djoser JWT routes: /api/auth/jwt/create/ (Login) and /api/auth/jwt/refresh/
-    path('api/auth/', include('djoser.urls.jwt')), 
-    
-    # Djoser Core User Management Endpoints: /api/auth/users/ (registration) and /api/auth/users/me/ (profile read/update)
-    path('api/auth/', include('djoser.urls')), 
-    
-    # The clean, direct dashboard metrics endpoint
-    # Full Path: /api/dashboard/metrics/
-    path('api/dashboard/metrics/', DashboardMetricsView.as_view(), name='dashboard-metrics'),
-    
-    # API Endpoints (Master routing)
-    path('api/clients/', include('clients.urls')), 
-    path('api/jobcards/', include('jobcards.urls')),
-    path('api/inventory/', include('inventory.urls')),
-    
-    # ✅ CRITICAL FIX: Add this line to include routes from the employees app
-    # Full Path: /api/employees/ (which handles the frontend request)
-    path('api/employees/', include('employees.urls')),
+    # Every API route shares the 'api/' prefix, so non-API requests (admin, media)
+    # skip the whole subtree after one prefix check
+    path('api/', include([
+        # Djoser JWT routes: /api/auth/jwt/create/ (Login) and /api/auth/jwt/refresh/
+        path('auth/', include('djoser.urls.jwt')), 
+        
+        # Djoser Core User Management Endpoints: /api/auth/users/ (registration) and /api/auth/users/me/ (profile read/update)
+        path('auth/', include('djoser.urls')), 
+        
+        # The clean, direct dashboard metrics endpoint
+        # Full Path: /api/dashboard/metrics/
+        path('dashboard/metrics/', DashboardMetricsView.as_view(), name='dashboard-metrics'),
+        
+        # API Endpoints (Master routing)
+        path('clients/', include('clients.urls')), 
+        path('jobcards/', include('jobcards.urls')),
+        path('inventory/', include('inventory.urls')),
+        
+        # ✅ CRITICAL FIX: Add this line to include routes from the employees app
+        # Full Path: /api/employees/ (which handles the frontend request)
+        path('employees/', include('employees.urls')),
+    ])),
 ]
 
 # ⭐ CRITICAL: Add this block to serve media files in development (when DEBUG=True)
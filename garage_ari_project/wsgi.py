@@ -10,7 +10,12 @@ https://docs.djangoproject.com/en/4.2/howto/deployment/wsgi/
 import os
 
 from django.core.wsgi import get_wsgi_application
+from django.urls import get_resolver
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'garage_ari_project.settings')
 
 application = get_wsgi_application()
+
+# Import the URLconf (and the views it pulls in) and build the resolver's lookup
+# tables while the worker boots, instead of during the first request it serves.
+get_resolver().reverse_dict
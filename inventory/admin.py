@@ -1,6 +1,8 @@
 # inventory/admin.py
 
 from django.contrib import admin
+from django.db.models import F, Value
+from django.db.models.functions import Greatest
 from .models import InventoryPart, Category, Vendor
 
 @admin.register(Category)
@@ -23,7 +25,12 @@ class InventoryPartAdmin(admin.ModelAdmin):
     # Custom admin actions for inventory management
     @admin.action(description='Increase stock by 10')
     def increase_stock(self, request, queryset):
-        for part in queryset:
-            part.stock_qty += 10
-            part.save()
-        self.message_user(request, f"Successfully increased stock for {queryset.count()} parts.")
\ No newline at end of file
+        # One UPDATE for the whole selection
+        count = queryset.update(stock_qty=F('stock_qty') + 10)
+        self.message_user(request, f"Successfully increased stock for {count} parts.")
+
+    @admin.action(description='Decrease stock by 10')
+    def decrease_stock(self, request, queryset):
+        # Stock never goes below zero
+        count = queryset.update(stock_qty=Greatest(F('stock_qty') - 10, Value(0)))
+        self.message_user(request, f"Successfully decreased stock for {count} parts.")
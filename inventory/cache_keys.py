@@ -0,0 +1,10 @@
+# inventory/cache_keys.py
+
+# The plain category/vendor lists (CachedLookupListMixin) are cached for this
+# long (seconds). Saves/deletes of the model evict the entry once they commit
+# (see inventory/signals.py).
+LOOKUP_CACHE_TIMEOUT = 300
+
+
+def lookup_list_cache_key(model):
+    return f'lookup-list:{model._meta.label_lower}'
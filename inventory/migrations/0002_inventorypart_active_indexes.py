@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-15 22:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='inventorypart',
+            index=models.Index(fields=['is_active', 'name'], name='part_active_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='inventorypart',
+            index=models.Index(fields=['is_active', 'sku'], name='part_active_sku_idx'),
+        ),
+    ]
@@ -83,6 +83,11 @@ class InventoryPart(models.Model):
         ordering = ['name']
         verbose_name = "Inventory Part"
         verbose_name_plural = "Inventory Parts"
+        indexes = [
+            # Active-parts list, ordered by name (default) or SKU
+            models.Index(fields=['is_active', 'name'], name='part_active_name_idx'),
+            models.Index(fields=['is_active', 'sku'], name='part_active_sku_idx'),
+        ]
         
     def __str__(self):
         return f"[{self.sku}] {self.name}"
\ No newline at end of file
@@ -51,4 +51,14 @@ class InventoryPartSerializer(serializers.ModelSerializer):
             'stock_qty', 'critical_qty', 
             'is_active', 'date_created'
         ]
-        read_only_fields = ['id', 'category_name', 'vendor_name', 'date_created']
\ No newline at end of file
+        read_only_fields = ['id', 'category_name', 'vendor_name', 'date_created']
+
+    @classmethod
+    def setup_eager_loading(cls, queryset):
+        """JOINs the category and vendor, loading only their names (not description/contact details)."""
+        return queryset.select_related('category', 'vendor').only(
+            'id', 'name', 'sku', 'category', 'vendor',
+            'cost_price', 'sale_price', 'stock_qty', 'critical_qty',
+            'is_active', 'date_created',
+            'category__name', 'vendor__name',
+        )
\ No newline at end of file
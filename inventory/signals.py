@@ -0,0 +1,24 @@
+# inventory/signals.py
+
+from functools import partial
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .models import Category, Vendor
+from .cache_keys import lookup_list_cache_key
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=Vendor)
+@receiver(post_delete, sender=Vendor)
+def evict_cached_lookup_list(sender, instance, **kwargs):
+    """
+    Drops the cached dropdown list (CachedLookupListMixin) once a change to one of
+    its rows commits; evicting earlier would let a concurrent request re-cache the
+    list from before the change.
+    """
+    transaction.on_commit(partial(cache.delete, lookup_list_cache_key(sender)))
@@ -1,3 +1,38 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from django.test import TestCase
+from rest_framework.test import APIClient
 
-# Create your tests here.
+from .cache_keys import lookup_list_cache_key
+from .models import Category
+
+
+class LookupListCacheTests(TestCase):
+    """The cached category/vendor dropdown lists are evicted once a change commits."""
+
+    def setUp(self):
+        user = get_user_model().objects.create_user(email='staff@example.com', password='x')
+        self.api = APIClient()
+        self.api.force_authenticate(user)
+        cache.clear()
+
+    def category_names(self):
+        response = self.api.get('/api/inventory/categories/')
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        return [row['name'] for row in data.get('results', data)]
+
+    def test_list_is_cached_and_evicted_on_commit(self):
+        Category.objects.create(name='Filters')
+        self.assertEqual(self.category_names(), ['Filters'])
+        key = lookup_list_cache_key(Category)
+        self.assertIsNotNone(cache.get(key))
+
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            Category.objects.create(name='Brakes')
+        # Still cached until the write commits
+        self.assertIsNotNone(cache.get(key))
+        for callback in callbacks:
+            callback()
+        self.assertIsNone(cache.get(key))
+        self.assertEqual(sorted(self.category_names()), ['Brakes', 'Filters'])
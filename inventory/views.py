@@ -1,11 +1,39 @@
 # inventory/views.py
 
+from django.core.cache import cache
 from rest_framework import viewsets
+from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.filters import SearchFilter, OrderingFilter
+from .cache_keys import LOOKUP_CACHE_TIMEOUT, lookup_list_cache_key
 from .models import InventoryPart, Category, Vendor
 from .serializers import InventoryPartSerializer, CategorySerializer, VendorSerializer
 
+# ----------------------------------
+# 0. Lookup list caching (dropdown data)
+# ----------------------------------
+
+class CachedLookupListMixin:
+    """
+    Serves the unfiltered list from the cache. The dropdowns only request that;
+    searches and other pages (any query parameter) are computed as usual.
+    """
+    def list(self, request, *args, **kwargs):
+        if request.query_params:
+            return super().list(request, *args, **kwargs)
+
+        # Pagination links are absolute, so the entry is tied to the host
+        cache_key = lookup_list_cache_key(self.queryset.model)
+        host = request.get_host()
+        cached = cache.get(cache_key)
+        if cached is not None and cached[0] == host:
+            return Response(cached[1])
+
+        response = super().list(request, *args, **kwargs)
+        cache.set(cache_key, (host, response.data), LOOKUP_CACHE_TIMEOUT)
+        return response
+
+
 # ----------------------------------
 # 1. InventoryPart ViewSet (Core Parts CRUD)
 # ----------------------------------
@@ -14,7 +42,8 @@ class InventoryPartViewSet(viewsets.ModelViewSet):
     """
     Provides full CRUD for Inventory Parts. Supports searching and filtering.
     """
-    queryset = InventoryPart.objects.filter(is_active=True).select_related('category', 'vendor')
+    # Related rows are loaded by the serializer's setup_eager_loading()
+    queryset = InventoryPart.objects.filter(is_active=True)
     serializer_class = InventoryPartSerializer
     permission_classes = [IsAuthenticated]
     
@@ -27,6 +56,9 @@ class InventoryPartViewSet(viewsets.ModelViewSet):
     # Ordering fields: allows frontend sorting by these fields
     ordering_fields = ['name', 'sku', 'sale_price', 'stock_qty']
     
+    def get_queryset(self):
+        return self.get_serializer_class().setup_eager_loading(super().get_queryset())
+    
     def perform_destroy(self, instance):
         """
         Soft-delete: Mark part as inactive instead of deleting it to preserve history 
@@ -40,7 +72,7 @@ class InventoryPartViewSet(viewsets.ModelViewSet):
 # 2. Category ViewSet (Lookup Data)
 # ----------------------------------
 
-class CategoryViewSet(viewsets.ModelViewSet):
+class CategoryViewSet(CachedLookupListMixin, viewsets.ModelViewSet):
     """
     CRUD for part categories. Used to populate dropdowns.
     """
@@ -55,7 +87,7 @@ class CategoryViewSet(viewsets.ModelViewSet):
 # 3. Vendor ViewSet (Lookup Data)
 # ----------------------------------
 
-class VendorViewSet(viewsets.ModelViewSet):
+class VendorViewSet(CachedLookupListMixin, viewsets.ModelViewSet):
     """
     CRUD for vendors/suppliers. Used to populate dropdowns.
     """
@@ -0,0 +1,7 @@
+# jobcards/cache_keys.py
+
+# The Kanban board (JobCardKanbanView) is the same for every user, so it is built
+# at most once per timeout. Job card, line item, client and vehicle writes evict
+# it once they commit (see jobcards/signals.py).
+KANBAN_CACHE_KEY = 'jobcard_kanban'
+KANBAN_CACHE_TIMEOUT = 30
@@ -0,0 +1,40 @@
+# jobcards/management/commands/resync_total_paid.py
+
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.db.models import DecimalField, F, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+
+from jobcards.models import JobCard, Payment
+
+
+class Command(BaseCommand):
+    help = (
+        "Recomputes JobCard.total_paid from the payment rows. Payment.save()/delete() "
+        "keep it current with F() deltas; this repairs drift from writes that bypass "
+        "them (queryset updates/deletes, manual SQL)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run', action='store_true',
+            help="Only report how many job cards are out of sync.",
+        )
+
+    def handle(self, *args, **options):
+        paid = (
+            Payment.objects.filter(job_card=OuterRef('pk'))
+            .values('job_card').annotate(total=Sum('amount')).values('total')
+        )
+        paid = Coalesce(Subquery(paid), Value(Decimal('0.00')), output_field=DecimalField())
+
+        # Only rows whose stored value differs are rewritten
+        out_of_sync = JobCard.objects.alias(paid=paid).exclude(total_paid=F('paid'))
+
+        if options['dry_run']:
+            self.stdout.write(f"{out_of_sync.count()} job card(s) out of sync.")
+            return
+
+        fixed = out_of_sync.update(total_paid=paid)
+        self.stdout.write(self.style.SUCCESS(f"Resynced total_paid on {fixed} job card(s)."))
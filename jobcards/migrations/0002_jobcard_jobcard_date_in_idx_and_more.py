@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-15 21:56
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clients', '0017_client_client_active_created_idx'),
+        ('jobcards', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='jobcard',
+            index=models.Index(fields=['-date_in'], name='jobcard_date_in_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobcard',
+            index=models.Index(fields=['status', 'date_completed'], name='jobcard_status_completed_idx'),
+        ),
+    ]
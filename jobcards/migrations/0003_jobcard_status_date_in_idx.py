@@ -0,0 +1,20 @@
+# Generated by Django 5.2.18 on 2026-10-15 22:09
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clients', '0017_client_client_active_created_idx'),
+        ('jobcards', '0002_jobcard_jobcard_date_in_idx_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='jobcard',
+            index=models.Index(fields=['status', 'date_in'], name='jobcard_status_date_in_idx'),
+        ),
+    ]
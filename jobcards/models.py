@@ -1,9 +1,11 @@
 # jobcards/models.py
 
-from django.db import models
+import uuid
+
+from django.db import models, transaction
 from django.conf import settings
 from clients.models import Client, Vehicle
-from django.db.models import Sum, Q # 🚀 ADDED Sum and Q for aggregation
+from django.db.models import F, OuterRef, Subquery, Sum, Q # 🚀 ADDED Sum and Q for aggregation
 from decimal import Decimal # 🚀 ADDED Decimal for precise calculations
 
 # --- Tax Rate: Define this as a constant, used in recalculation ---
@@ -23,6 +25,8 @@ class JobCard(models.Model):
         ('PAID', 'Paid'),
         ('CANCELED', 'Canceled'),
     ]
+    # Status keys, for O(1) validation of incoming values
+    VALID_STATUSES = frozenset(key for key, _ in STATUS_CHOICES)
 
     # Relationships (Foreign Keys)
     client = models.ForeignKey(
@@ -67,17 +71,32 @@ class JobCard(models.Model):
         ordering = ['-date_in']
         verbose_name = "Job Card"
         verbose_name_plural = "Job Cards"
+        indexes = [
+            # Default ordering / appointment windows, and the paid-revenue date ranges
+            models.Index(fields=['-date_in'], name='jobcard_date_in_idx'),
+            models.Index(fields=['status', 'date_completed'], name='jobcard_status_completed_idx'),
+            # Kanban board: active statuses, oldest check-in first
+            models.Index(fields=['status', 'date_in'], name='jobcard_status_date_in_idx'),
+        ]
 
     def __str__(self):
         return f"Job #{self.job_number} - {self.client.full_name}"
 
     def save(self, *args, **kwargs):
-        """Auto-generate job number on creation if not set."""
-        if not self.job_number:
-            last_job = JobCard.objects.all().order_by('-id').first()
-            new_id = (last_job.id if last_job else 0) + 1
-            self.job_number = f'J{new_id:06d}' # e.g., J000001
-        super().save(*args, **kwargs)
+        """
+        Auto-generate job number on creation if not set.
+        The number is taken from the row's own id, so it needs no read of the
+        latest job and cannot collide when two jobs are created at once.
+        """
+        if self.job_number:
+            super().save(*args, **kwargs)
+            return
+        with transaction.atomic():
+            # Unique placeholder until the id is known
+            self.job_number = f'TMP-{uuid.uuid4().hex[:16]}'
+            super().save(*args, **kwargs)
+            self.job_number = f'J{self.pk:06d}' # e.g., J000001
+            JobCard.objects.filter(pk=self.pk).update(job_number=self.job_number)
         
     @property
     def balance_due(self):
@@ -86,31 +105,44 @@ class JobCard(models.Model):
     # 🚀 NEW CRITICAL METHOD FOR FINANCIAL INTEGRITY
     def recalculate_totals(self):
         """
-        Aggregates LineItems and recalculates all financial summary fields.
+        Aggregates LineItems and Payments and recalculates all financial summary fields.
         Must be called from serializer's create/update methods.
+        Reads everything in one query and writes only the five total columns.
         """
-        # 1. Aggregate LineItem totals by type
-        totals = self.line_items.aggregate(
-            parts=Sum('line_total', filter=Q(item_type='PART')),
-            labor=Sum('line_total', filter=Q(item_type='LABOR')),
-            fees=Sum('line_total', filter=Q(item_type='FEE'))
+        # 1. Aggregate LineItem totals by type, plus payments (as a subquery, so
+        #    the line-item JOIN doesn't multiply the payment rows)
+        paid = (
+            Payment.objects.filter(job_card=OuterRef('pk'))
+            .values('job_card').annotate(total=Sum('amount')).values('total')
         )
+        totals = JobCard.objects.filter(pk=self.pk).annotate(
+            parts=Sum('line_items__line_total', filter=Q(line_items__item_type='PART')),
+            labor=Sum('line_items__line_total', filter=Q(line_items__item_type='LABOR')),
+            fees=Sum('line_items__line_total', filter=Q(line_items__item_type='FEE')),
+            paid=Subquery(paid),
+        ).values('parts', 'labor', 'fees', 'paid').get()
         
         # Coalesce to 0.00 and combine labor/fees
-        self.parts_subtotal = totals.get('parts') or Decimal('0.00')
-        self.labor_subtotal = (totals.get('labor') or Decimal('0.00')) + (totals.get('fees') or Decimal('0.00'))
+        self.parts_subtotal = totals['parts'] or Decimal('0.00')
+        self.labor_subtotal = (totals['labor'] or Decimal('0.00')) + (totals['fees'] or Decimal('0.00'))
 
         # 2. Calculate Tax and Total Due
         subtotal = self.parts_subtotal + self.labor_subtotal
         self.tax_amount = subtotal * TAX_RATE
         self.total_due = subtotal + self.tax_amount
         
-        # Note: total_paid is updated via the Payment model's save method, 
-        # but we can optionally update it here for completeness:
-        self.total_paid = self.payments.aggregate(total=Sum('amount'))['total'] or Decimal('0.00')
-
-        # NOTE: self.save() must be called externally by the view/serializer
-        # to commit these changes to the database.
+        # Note: total_paid is kept current by Payment.save()/delete(),
+        # but it is re-summed here too so any drift is corrected:
+        self.total_paid = totals['paid'] or Decimal('0.00')
+
+        # 3. Persist just the totals (no full-row save)
+        JobCard.objects.filter(pk=self.pk).update(
+            parts_subtotal=self.parts_subtotal,
+            labor_subtotal=self.labor_subtotal,
+            tax_amount=self.tax_amount,
+            total_due=self.total_due,
+            total_paid=self.total_paid,
+        )
 
 
 class LineItem(models.Model):
@@ -180,12 +212,43 @@ class Payment(models.Model):
         return f"Payment of {self.amount} for Job #{self.job_card.job_number}"
 
     def save(self, *args, **kwargs):
-        is_new = self.pk is None
-        
-        super().save(*args, **kwargs)
-        
-        if is_new:
-            self.job_card.total_paid = self.job_card.payments.aggregate(
-                total=models.Sum('amount')
-            )['total'] or Decimal('0.00')
-            self.job_card.save()
\ No newline at end of file
+        """
+        Moves the job card's total_paid by this payment's amount (or by the change
+        in amount on edit) with one UPDATE, instead of re-summing every payment
+        and re-saving the whole job card. A payment moved to another job card is
+        taken off the old card's total and added in full to the new one.
+        """
+        with transaction.atomic():
+            # Read the stored row under a lock, so concurrent edits of the same
+            # payment each apply their delta against the other's result
+            old = None
+            if self.pk is not None:
+                old = (
+                    Payment.objects.select_for_update()
+                    .filter(pk=self.pk).values_list('job_card_id', 'amount').first()
+                )
+            super().save(*args, **kwargs)
+            if old is None:
+                self._apply_to_total_paid(self.amount)
+            elif old[0] != self.job_card_id:
+                JobCard.objects.filter(pk=old[0]).update(total_paid=F('total_paid') - old[1])
+                self._apply_to_total_paid(self.amount)
+            elif self.amount != old[1]:
+                self._apply_to_total_paid(self.amount - old[1])
+
+    def delete(self, *args, **kwargs):
+        with transaction.atomic():
+            # Subtract what is stored, not the (possibly edited) in-memory amount
+            stored = (
+                Payment.objects.select_for_update()
+                .filter(pk=self.pk).values_list('job_card_id', 'amount').first()
+            )
+            result = super().delete(*args, **kwargs)
+            if stored is not None:
+                JobCard.objects.filter(pk=stored[0]).update(total_paid=F('total_paid') - stored[1])
+        return result
+
+    def _apply_to_total_paid(self, delta):
+        if not delta:
+            return
+        JobCard.objects.filter(pk=self.job_card_id).update(total_paid=F('total_paid') + delta)
\ No newline at end of file
@@ -4,6 +4,16 @@ from rest_framework import serializers
 from .models import JobCard, LineItem, Payment
 from clients.models import Client, Vehicle
 from django.db import transaction
+from django.db.models import CharField, Value
+from django.db.models.functions import Cast, Coalesce, Concat, NullIf
+
+def display_text(field):
+    """
+    The column as text for a DB-side Concat, rendered like an f-string would:
+    a missing value becomes 'None'.
+    """
+    return Coalesce(Cast(field, CharField()), Value('None'))
+
 
 # ----------------------------------
 # 1. Payment Serializer
@@ -23,6 +33,9 @@ class PaymentSerializer(serializers.ModelSerializer):
 # ----------------------------------
 
 class LineItemSerializer(serializers.ModelSerializer):
+    # Writable so JobCardSerializer.update() can match submitted items to existing rows
+    id = serializers.IntegerField(required=False)
+
     class Meta:
         model = LineItem
         fields = [
@@ -81,8 +94,34 @@ class JobCardSerializer(serializers.ModelSerializer):
             'client_name', 'vehicle_info', 'technician_name'
         ]
         
+    @classmethod
+    def setup_eager_loading(cls, queryset):
+        """
+        JOINs client and technician, and builds vehicle_info in the query itself,
+        so the list doesn't load a Vehicle object per row to format it.
+        Of the joined (wide) client and user rows only the displayed columns are read.
+        The nested line items and payments are fetched in one IN (...) query each.
+        """
+        return queryset.select_related('client', 'assigned_technician').prefetch_related(
+            'line_items', 'payments',
+        ).only(
+            'id', 'job_number', 'status', 'date_in', 'date_promised', 'date_completed',
+            'client', 'vehicle', 'assigned_technician', 'initial_odometer',
+            'parts_subtotal', 'labor_subtotal', 'tax_amount', 'total_due', 'total_paid',
+            'client__full_name', 'assigned_technician__id',
+        ).annotate(
+            vehicle_info=Concat(
+                display_text('vehicle__year'), Value(' '), display_text('vehicle__make'), Value(' '), display_text('vehicle__model'),
+                Value(' ('), Coalesce(NullIf('vehicle__license_plate', Value('')), Value('N/A')), Value(')'),
+                output_field=CharField(),
+            )
+        )
+
     def get_vehicle_info(self, obj):
         """Helper to format vehicle string for list views."""
+        if hasattr(obj, 'vehicle_info'):
+            return obj.vehicle_info
+        # Instances that didn't come from setup_eager_loading() (e.g. just created)
         return f"{obj.vehicle.year} {obj.vehicle.make} {obj.vehicle.model} ({obj.vehicle.license_plate or 'N/A'})"
 
 
@@ -98,11 +137,11 @@ class JobCardSerializer(serializers.ModelSerializer):
             
             # Create nested LineItems
             for item_data in line_items_data:
+                item_data.pop('id', None)
                 LineItem.objects.create(job_card=job_card, **item_data)
             
-            # Recalculate and save totals (JobCard model method would handle this)
-            job_card.recalculate_totals() # Assume this helper method exists on the JobCard model
-            job_card.save() 
+            # Recalculate and store totals (JobCard.recalculate_totals writes them itself)
+            job_card.recalculate_totals()
             
             return job_card
 
@@ -111,29 +150,44 @@ class JobCardSerializer(serializers.ModelSerializer):
         Handle updates for JobCard and nested LineItems. 
         This is complex: we must determine which line items were added, removed, or changed.
         """
-        line_items_data = validated_data.pop('line_items', [])
+        line_items_data = validated_data.pop('line_items', None)
         
         # 1. Update the JobCard instance fields (status, dates, etc.)
         for attr, value in validated_data.items():
             setattr(instance, attr, value)
         
+        # The annotated vehicle_info may describe the previous vehicle
+        instance.__dict__.pop('vehicle_info', None)
+        
         with transaction.atomic():
             instance.save()
             
-            # 2. Handle Line Items
-            # For simplicity, we'll implement a full replacement strategy here:
-            # Delete all existing items and re-create them from the incoming data.
-            # (A more advanced approach would diff the lists by ID).
-            instance.line_items.all().delete()
-            
-            for item_data in line_items_data:
-                LineItem.objects.create(job_card=instance, **item_data)
+            # 2. Handle Line Items (left untouched when the request doesn't send them)
+            # Diff by id so only changed rows are written: each write fires the
+            # stock-adjustment signals, so a full delete + re-create would adjust
+            # inventory twice for every unchanged item.
+            if line_items_data is not None:
+                existing = {item.id: item for item in instance.line_items.all()}
+                kept = set()
+                
+                for item_data in line_items_data:
+                    item = existing.get(item_data.pop('id', None))
+                    if item is None:
+                        LineItem.objects.create(job_card=instance, **item_data)
+                        continue
+                    
+                    kept.add(item.id)
+                    changed = [field for field, value in item_data.items() if getattr(item, field) != value]
+                    if changed:
+                        for field in changed:
+                            setattr(item, field, item_data[field])
+                        # line_total is recomputed by LineItem.save()
+                        item.save(update_fields=changed + ['line_total'])
+                
+                # Items missing from the request were removed on the form
+                instance.line_items.filter(id__in=existing.keys() - kept).delete()
             
             # 3. Recalculate totals after updating line items
-            instance.recalculate_totals() # Assume this helper method exists on the JobCard model
-            instance.save() 
+            instance.recalculate_totals() # Writes the total columns itself
         
             return instance
-
-# NOTE: Add a recalculate_totals() method to your JobCard model for clean updates.
-# (This method should calculate parts_subtotal, labor_subtotal, tax_amount, and total_due)
\ No newline at end of file
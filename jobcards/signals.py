@@ -1,42 +1,80 @@
 # jobcards/signals.py
 
-from django.db.models.signals import post_save, post_delete
-from django.dispatch import receiver
+from functools import partial
+from math import ceil
+
+from django.core.cache import cache
 from django.db import transaction
-from .models import LineItem
+from django.db.models import F, IntegerField, Value
+from django.db.models.functions import Greatest
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+from .models import JobCard, LineItem
+from .cache_keys import KANBAN_CACHE_KEY
+from clients.models import Client, Vehicle
 from inventory.models import InventoryPart # Import the part model
 
+
+def _adjust_stock(sku, delta):
+    """
+    Subtracts `delta` whole units (negative to restore) from the part's stock in
+    one UPDATE, so concurrent line-item changes can't overwrite each other's
+    adjustment. Stock never goes below zero. Returns False if no part has this SKU.
+    """
+    new_qty = Greatest(F('stock_qty') - Value(delta), Value(0), output_field=IntegerField())
+    return bool(InventoryPart.objects.filter(sku=sku).update(stock_qty=new_qty))
+
+
+def _stock_usage(item_type, sku, quantity):
+    """
+    The (sku, whole units) a line item takes from stock, or None if it takes none.
+    Stock is counted in whole parts, so a fractional quantity uses up the next
+    whole unit; computing every adjustment from these units lets create, update
+    and delete cancel out exactly on any backend.
+    """
+    if item_type == 'PART' and sku:
+        return sku, ceil(quantity)
+    return None
+
+
+@receiver(pre_save, sender=LineItem)
+def remember_lineitem_stock_usage(sender, instance, **kwargs):
+    """
+    Records the stored item's stock usage before an update; by post_save the row
+    has already been rewritten, so the old values can no longer be read back.
+    """
+    instance._old_stock_usage = None
+    if instance.pk is not None:
+        old = LineItem.objects.filter(pk=instance.pk).values_list('item_type', 'sku', 'quantity').first()
+        if old is not None:
+            instance._old_stock_usage = _stock_usage(*old)
+
+
 @receiver(post_save, sender=LineItem)
 def update_inventory_on_lineitem_save(sender, instance, created, **kwargs):
     """
     Adjusts inventory stock when a LineItem is created or updated.
     This logic runs within the serializer's transaction (if called from a view).
     """
-    if instance.item_type == 'PART' and instance.sku:
-        try:
-            part = InventoryPart.objects.get(sku=instance.sku)
-            
-            # Use F expression for safe, concurrent update
-            with transaction.atomic():
-                if created:
-                    # New item: Decrease stock by the quantity used
-                    part.stock_qty = part.stock_qty - instance.quantity
-                else:
-                    # Item updated: Calculate the difference between old and new quantity
-                    # We retrieve the old value from the database before the update committed
-                    old_quantity = LineItem.objects.get(pk=instance.pk).quantity 
-                    diff = old_quantity - instance.quantity
-                    part.stock_qty = part.stock_qty + diff
-                
-                # Prevent stock from going negative and save
-                if part.stock_qty < 0:
-                     part.stock_qty = 0 # Simple guardrail
-                
-                part.save()
-                
-        except InventoryPart.DoesNotExist:
+    old_usage = None if created else getattr(instance, '_old_stock_usage', None)
+    new_usage = _stock_usage(instance.item_type, instance.sku, instance.quantity)
+
+    if old_usage and new_usage and old_usage[0] == new_usage[0]:
+        # Same part: Decrease stock by the increase in quantity (or restore the decrease)
+        adjustments = [(new_usage[0], new_usage[1] - old_usage[1])]
+    else:
+        # New item, or the item switched part/type: return the old part's quantity
+        # and take the new part's
+        adjustments = []
+        if old_usage:
+            adjustments.append((old_usage[0], -old_usage[1]))
+        if new_usage:
+            adjustments.append(new_usage)
+
+    for sku, delta in adjustments:
+        if delta and not _adjust_stock(sku, delta):
             # Important: Log this warning in a real system
-            print(f"WARNING: Inventory Part with SKU {instance.sku} not found during stock adjustment.")
+            print(f"WARNING: Inventory Part with SKU {sku} not found during stock adjustment.")
 
 
 @receiver(post_delete, sender=LineItem)
@@ -44,14 +82,24 @@ def restore_inventory_on_lineitem_delete(sender, instance, **kwargs):
     """
     Restores inventory stock when a LineItem is deleted from a job card.
     """
-    if instance.item_type == 'PART' and instance.sku:
-        try:
-            part = InventoryPart.objects.get(sku=instance.sku)
-            
-            with transaction.atomic():
-                # Restore the quantity that was previously used
-                part.stock_qty = part.stock_qty + instance.quantity
-                part.save()
-                
-        except InventoryPart.DoesNotExist:
-            print(f"WARNING: Inventory Part with SKU {instance.sku} not found during stock restoration.")
\ No newline at end of file
+    usage = _stock_usage(instance.item_type, instance.sku, instance.quantity)
+    if usage:
+        # Restore the quantity that was previously used
+        if not _adjust_stock(usage[0], -usage[1]):
+            print(f"WARNING: Inventory Part with SKU {instance.sku} not found during stock restoration.")
+
+
+@receiver(post_save, sender=JobCard)
+@receiver(post_delete, sender=JobCard)
+@receiver(post_save, sender=LineItem)
+@receiver(post_delete, sender=LineItem)
+@receiver(post_save, sender=Client)
+@receiver(post_save, sender=Vehicle)
+def evict_kanban_board(sender, instance, **kwargs):
+    """
+    Drops the cached Kanban board (JobCardKanbanView) after the write commits.
+    Totals are written later in the same transaction with .update(), which
+    sends no signal, so evicting right away could let a concurrent read
+    re-cache the old totals.
+    """
+    transaction.on_commit(partial(cache.delete, KANBAN_CACHE_KEY))
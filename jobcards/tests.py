@@ -1,3 +1,208 @@
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from clients.models import Client, Vehicle
+from inventory.models import InventoryPart
+from .models import JobCard, LineItem, Payment
+
+
+class LineItemStockTests(TestCase):
+    """Stock adjustments made by the line-item signals through the job card API."""
+
+    def setUp(self):
+        user = get_user_model().objects.create_user(email='tech@example.com', password='x')
+        self.api = APIClient()
+        self.api.force_authenticate(user)
+
+        client = Client.objects.create(first_name='Jane', last_name='Doe', phone_number='+255700000000')
+        vehicle = Vehicle.objects.create(client=client, make='Toyota', model='Hilux', year=2010, vin='VIN1')
+        self.job_card = JobCard.objects.create(client=client, vehicle=vehicle, initial_odometer=1)
+
+        self.part_a = InventoryPart.objects.create(name='A', sku='A', cost_price=1, sale_price=2, stock_qty=10)
+        self.part_b = InventoryPart.objects.create(name='B', sku='B', cost_price=1, sale_price=2, stock_qty=10)
+
+    def put_line_items(self, line_items):
+        response = self.api.patch(
+            f'/api/jobcards/{self.job_card.id}/', {'line_items': line_items}, format='json'
+        )
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.json()['line_items']
+
+    def assertStock(self, part_a, part_b):
+        self.part_a.refresh_from_db()
+        self.part_b.refresh_from_db()
+        self.assertEqual((self.part_a.stock_qty, self.part_b.stock_qty), (part_a, part_b))
+
+    def part_item(self, sku, quantity, **extra):
+        return {'item_type': 'PART', 'description': 'Part', 'sku': sku,
+                'quantity': quantity, 'unit_price': '5.00', **extra}
+
+    def test_quantity_change_adjusts_the_difference(self):
+        item = self.put_line_items([self.part_item('A', '2')])[0]
+        self.assertStock(8, 10)
+        self.put_line_items([self.part_item('A', '5', id=item['id'])])
+        self.assertStock(5, 10)
+
+    def test_switching_part_moves_the_stock(self):
+        item = self.put_line_items([self.part_item('A', '2')])[0]
+        self.assertStock(8, 10)
+        self.put_line_items([self.part_item('B', '2', id=item['id'])])
+        self.assertStock(10, 8)
+
+    def test_switching_part_to_labor_returns_the_stock(self):
+        item = self.put_line_items([self.part_item('A', '2')])[0]
+        self.put_line_items([{'id': item['id'], 'item_type': 'LABOR', 'description': 'Fitting',
+                              'quantity': '2', 'unit_price': '5.00'}])
+        self.assertStock(10, 10)
+
+    def test_fractional_quantities_use_whole_units_and_cancel_out(self):
+        item = self.put_line_items([self.part_item('A', '2.5')])[0]
+        self.assertStock(7, 10)
+        self.put_line_items([self.part_item('A', '3', id=item['id'])])
+        self.assertStock(7, 10)
+        self.put_line_items([self.part_item('A', '0.5', id=item['id'])])
+        self.assertStock(9, 10)
+        response = self.api.delete(f'/api/jobcards/{self.job_card.id}/')
+        self.assertEqual(response.status_code, 204)
+        self.assertStock(10, 10)
+
+    def test_removed_item_returns_the_stock(self):
+        self.put_line_items([self.part_item('A', '2')])
+        self.put_line_items([])
+        self.assertStock(10, 10)
+        self.assertFalse(LineItem.objects.exists())
+
+
+class PaymentTotalPaidTests(TestCase):
+    """Payment.save()/delete() keep JobCard.total_paid in step with the payment rows."""
+
+    def setUp(self):
+        client = Client.objects.create(first_name='Jane', last_name='Doe', phone_number='+255700000000')
+        vehicle = Vehicle.objects.create(client=client, make='Toyota', model='Hilux', year=2010, vin='VIN1')
+        self.card_a = JobCard.objects.create(client=client, vehicle=vehicle, initial_odometer=1)
+        self.card_b = JobCard.objects.create(client=client, vehicle=vehicle, initial_odometer=1)
+
+    def assertTotals(self, card_a, card_b):
+        self.card_a.refresh_from_db()
+        self.card_b.refresh_from_db()
+        self.assertEqual((self.card_a.total_paid, self.card_b.total_paid), (Decimal(card_a), Decimal(card_b)))
+
+    def pay(self, amount, job_card=None):
+        return Payment.objects.create(job_card=job_card or self.card_a, amount=Decimal(amount), payment_method='CASH')
+
+    def test_new_payments_add_up(self):
+        self.pay('10.00')
+        self.pay('2.50')
+        self.assertTotals('12.50', '0')
+
+    def test_edit_applies_the_difference(self):
+        payment = self.pay('10.00')
+        payment.amount = Decimal('4.00')
+        payment.save()
+        self.assertTotals('4.00', '0')
+
+    def test_move_to_another_job_card(self):
+        payment = self.pay('10.00')
+        payment.job_card = self.card_b
+        payment.amount = Decimal('12.00')
+        payment.save()
+        self.assertTotals('0', '12.00')
+
+    def test_delete_subtracts_the_stored_amount(self):
+        self.pay('3.00')
+        payment = self.pay('10.00')
+        payment.amount = Decimal('99.00')  # unsaved edit
+        payment.delete()
+        self.assertTotals('3.00', '0')
+
+    def test_totals_match_recalculation(self):
+        payment = self.pay('10.00')
+        self.pay('5.00', self.card_b)
+        payment.job_card = self.card_b
+        payment.save()
+        for card in (self.card_a, self.card_b):
+            card.refresh_from_db()
+            stored = card.total_paid
+            card.recalculate_totals()
+            self.assertEqual(stored, card.total_paid)
+
+
+class JobNumberTests(TestCase):
+    """JobCard.save() numbers new cards from their own id."""
+
+    def setUp(self):
+        self.client_obj = Client.objects.create(first_name='Jane', last_name='Doe', phone_number='+255700000000')
+        self.vehicle = Vehicle.objects.create(client=self.client_obj, make='Toyota', vin='VIN1')
+
+    def create(self, **fields):
+        return JobCard.objects.create(client=self.client_obj, vehicle=self.vehicle, initial_odometer=1, **fields)
+
+    def test_number_is_derived_from_the_id(self):
+        first, second = self.create(), self.create()
+        for job_card in (first, second):
+            self.assertEqual(job_card.job_number, f'J{job_card.pk:06d}')
+            job_card.refresh_from_db()
+            self.assertEqual(job_card.job_number, f'J{job_card.pk:06d}')
+
+    def test_placeholder_is_written_first(self):
+        with CaptureQueriesContext(connection) as queries:
+            job_card = self.create()
+        insert, update = [q['sql'] for q in queries if q['sql'].startswith(('INSERT', 'UPDATE'))]
+        self.assertIn('TMP-', insert)
+        self.assertNotIn(job_card.job_number, insert)
+        self.assertIn(job_card.job_number, update)
+
+    def test_existing_number_is_kept(self):
+        job_card = self.create()
+        job_card.notes = 'Rechecked'
+        job_card.save()
+        job_card.refresh_from_db()
+        self.assertEqual(job_card.job_number, f'J{job_card.pk:06d}')
+
+
+class KanbanETagTests(TestCase):
+    """The Kanban board answers 304 for an unchanged board and a new ETag once a job card change commits."""
+
+    def setUp(self):
+        user = get_user_model().objects.create_user(email='tech@example.com', password='x')
+        self.api = APIClient()
+        self.api.force_authenticate(user)
+        cache.clear()
+        client = Client.objects.create(first_name='Jane', last_name='Doe', phone_number='+255700000000')
+        vehicle = Vehicle.objects.create(client=client, make='Toyota', vin='VIN1')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.job_card = JobCard.objects.create(client=client, vehicle=vehicle, initial_odometer=1, status='OPEN')
+
+    def get_board(self, etag=None):
+        headers = {'HTTP_IF_NONE_MATCH': etag} if etag else {}
+        return self.api.get('/api/jobcards/kanban/', **headers)
+
+    def test_not_modified_until_a_card_changes(self):
+        first = self.get_board()
+        self.assertEqual(first.status_code, 200)
+        etag = first['ETag']
+
+        not_modified = self.get_board(etag)
+        self.assertEqual(not_modified.status_code, 304)
+        self.assertFalse(not_modified.content)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.job_card.status = 'CLOSED'
+            self.job_card.save()
+        changed = self.get_board(etag)
+        self.assertEqual(changed.status_code, 200)
+        self.assertNotEqual(changed['ETag'], etag)
 
-# Create your tests here.
+    def test_status_endpoint_evicts_the_board(self):
+        etag = self.get_board()['ETag']
+        response = self.api.post(
+            f'/api/jobcards/{self.job_card.pk}/update-status/', {'status': 'CLOSED'}, format='json'
+        )
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(self.get_board(etag).status_code, 200)
@@ -1,15 +1,30 @@
 # jobcards/views.py
 
+import binascii
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from itertools import groupby
+from operator import itemgetter
+
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.filters import SearchFilter, OrderingFilter
+from rest_framework.pagination import CursorPagination
 from rest_framework.views import APIView # <-- IMPORTED FOR KANBAN VIEW
-from django.db.models import Sum
+from django.core.cache import cache
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db.models import Count, Q, Sum, Value
+from django.db.models.functions import Concat
+from django.http import Http404
+from django.utils.dateparse import parse_datetime
 
+from .cache_keys import KANBAN_CACHE_KEY, KANBAN_CACHE_TIMEOUT
 from .models import JobCard, Payment
-from .serializers import JobCardSerializer, PaymentSerializer
+from clients.cache_keys import DASHBOARD_CACHE_KEY
+from garage_ari_project.etags import etag_response
+from .serializers import JobCardSerializer, PaymentSerializer, display_text
 
 # --- Assuming these related models are available for imports. Adjust if path is different. ---
 # If JobCard is in this app, you don't need these here, but for clarity:
@@ -20,13 +35,23 @@ from .serializers import JobCardSerializer, PaymentSerializer
 # 1. JobCard ViewSet (CRUD, Search, Status Management)
 # ----------------------------------
 
+class JobCardCursorPagination(CursorPagination):
+    """
+    Pages job cards by an opaque cursor on the indexed date_in column: each page
+    is a range seek, with no COUNT(*) and no OFFSET that grows with page depth.
+    """
+    ordering = '-date_in'
+
+
 class JobCardViewSet(viewsets.ModelViewSet):
     """
     Provides CRUD for Job Cards. Supports searching, filtering, and status actions.
     """
-    queryset = JobCard.objects.select_related('client', 'vehicle', 'assigned_technician')
+    # Related rows are loaded by the serializer's setup_eager_loading()
+    queryset = JobCard.objects.all()
     serializer_class = JobCardSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = JobCardCursorPagination
     
     filter_backends = [SearchFilter, OrderingFilter]
     
@@ -41,21 +66,30 @@ class JobCardViewSet(viewsets.ModelViewSet):
     def get_queryset(self):
         """Filter queryset based on user role or display active jobs."""
         # For simplicity, we filter by the status field set by the client (e.g., OPEN, PAID)
-        return super().get_queryset()
+        return self.get_serializer_class().setup_eager_loading(super().get_queryset())
 
     @action(detail=True, methods=['post'], url_path='update-status')
     def update_status(self, request, pk=None):
-        """Custom endpoint to quickly update the job card status."""
-        job_card = self.get_object()
+        """
+        Custom endpoint to quickly update the job card status.
+        Writes the one column with a single UPDATE, without loading the job card.
+        """
         new_status = request.data.get('status')
         
-        if new_status and new_status in [choice[0] for choice in JobCard.STATUS_CHOICES]:
-            job_card.status = new_status
-            job_card.save()
-            # Respond with the updated serialized object if needed, but a success message is fine.
-            return Response({'status': f'Job card status updated to {new_status}'})
+        if not (isinstance(new_status, str) and new_status in JobCard.VALID_STATUSES):
+            return Response({'error': 'Invalid status provided'}, status=status.HTTP_400_BAD_REQUEST)
         
-        return Response({'error': 'Invalid status provided'}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            updated = JobCard.objects.filter(pk=pk).update(status=new_status)
+        except (TypeError, ValueError, DjangoValidationError):
+            updated = 0
+        if not updated:
+            raise Http404
+        
+        # .update() sends no post_save, so drop the caches that show job statuses here
+        cache.delete_many([KANBAN_CACHE_KEY, DASHBOARD_CACHE_KEY])
+        # Respond with the updated serialized object if needed, but a success message is fine.
+        return Response({'status': f'Job card status updated to {new_status}'})
 
     
 # ----------------------------------
@@ -75,7 +109,9 @@ class PaymentViewSet(viewsets.GenericViewSet, viewsets.mixins.CreateModelMixin):
         job_card_id = self.kwargs.get('job_card_pk') 
         
         try:
-            job_card = JobCard.objects.get(pk=job_card_id)
+            # Only the id is needed to link the payment; Payment.save() moves
+            # total_paid with a single atomic UPDATE, so no row lock is taken
+            job_card = JobCard.objects.only('id').get(pk=job_card_id)
         except JobCard.DoesNotExist:
             return Response({'detail': 'Job Card not found.'}, status=status.HTTP_404_NOT_FOUND)
         
@@ -93,45 +129,159 @@ class PaymentViewSet(viewsets.GenericViewSet, viewsets.mixins.CreateModelMixin):
 # ----------------------------------
 # 3. Kanban Board API View (NEW)
 # ----------------------------------
+# Define the active statuses for the Kanban columns (excluding 'PAID'/'CLOSED')
+# Ensure these match the JobCard.STATUS_CHOICES keys
+KANBAN_STATUSES = ['OPEN', 'IN_PROGRESS', 'READY_FOR_PICKUP']
+
+# Upper bound for ?limit= on the paged board
+KANBAN_MAX_PAGE_SIZE = 200
+
+
+def _kanban_card(job_card):
+    """Formats one .values() row as a Kanban card."""
+    # We must use string formatting for dates and currency for the frontend
+    date_in = job_card['date_in']
+    total_due = job_card['total_due']
+    return {
+        'id': job_card['id'],
+        'job_number': job_card['job_number'],
+        'status': job_card['status'],
+        'client_name': job_card['client_name'],
+        'vehicle_license': job_card['vehicle__license_plate'],
+        'vehicle_model': job_card['vehicle_model'],
+        # Only display the date part
+        'date_in': date_in.strftime('%Y-%m-%d') if date_in else None,
+        'total_due': f"Tsh {total_due:,.0f}" if total_due is not None else "Tsh 0",
+    }
+
+
+def _kanban_rows():
+    """
+    Active job cards as .values() rows with only the displayed columns; the name
+    strings are built in the query.
+    """
+    return JobCard.objects.filter(
+        status__in=KANBAN_STATUSES
+    ).annotate(
+        client_name=Concat(display_text('client__first_name'), Value(' '), display_text('client__last_name')),
+        vehicle_model=Concat(display_text('vehicle__make'), Value(' '), display_text('vehicle__model')),
+    ).values(
+        'id', 'job_number', 'status', 'client_name', 'vehicle__license_plate',
+        'vehicle_model', 'date_in', 'total_due',
+    )
+
+
+def _build_kanban_board():
+    """Runs the Kanban query and returns the response payload."""
+    # Fetch all active job cards, grouped by status and ordered by date_in (check-in
+    # date) within each, which is the (status, date_in) index order.
+    job_cards = _kanban_rows().order_by('status', 'date_in')
+    
+    # Prepare the data structure to group cards by status
+    kanban_data = {status: [] for status in KANBAN_STATUSES}
+    
+    # Rows arrive in one run per status, so each column is filled in a single pass
+    for card_status, rows in groupby(job_cards, key=itemgetter('status')):
+        kanban_data[card_status] = [_kanban_card(job_card) for job_card in rows]
+
+    # Include the list of status keys for the frontend to easily iterate
+    return {
+        'statuses': KANBAN_STATUSES,
+        'columns': kanban_data,
+        'counts': {status: len(cards) for status, cards in kanban_data.items()},
+    }
+
+
+def _encode_kanban_cursor(job_card):
+    """Opaque "load more" cursor: the (date_in, id) position of the column's last card."""
+    position = [job_card['date_in'].isoformat(), job_card['id']]
+    return urlsafe_b64encode(json.dumps(position).encode()).decode()
+
+
+def _decode_kanban_cursor(cursor):
+    """Inverse of _encode_kanban_cursor(). Raises ValueError for a malformed cursor."""
+    try:
+        date_in, pk = json.loads(urlsafe_b64decode(cursor.encode()))
+        date_in, pk = parse_datetime(date_in), int(pk)
+    except (TypeError, ValueError, binascii.Error):
+        raise ValueError(cursor)
+    if date_in is None:
+        raise ValueError(cursor)
+    return date_in, pk
+
+
+def _kanban_column_page(card_status, limit, after=None):
+    """
+    One column's next `limit` cards after the `after` position, as a keyset seek
+    on (date_in, id), plus the cursor for the following page (None on the last).
+    """
+    rows = _kanban_rows().filter(status=card_status)
+    if after is not None:
+        date_in, pk = after
+        rows = rows.filter(Q(date_in__gt=date_in) | Q(date_in=date_in, id__gt=pk))
+    # One extra row tells whether another page exists
+    rows = list(rows.order_by('date_in', 'id')[:limit + 1])
+    next_cursor = _encode_kanban_cursor(rows[limit - 1]) if len(rows) > limit else None
+    return [_kanban_card(job_card) for job_card in rows[:limit]], next_cursor
+
+
 class JobCardKanbanView(APIView):
     """
     Returns active Job Cards grouped by their status for the Kanban board.
     Filters out 'PAID' status by default.
+
+    Without parameters the whole board is returned. With ?limit=N each column is
+    capped at N cards and 'next_cursors' holds a cursor per column; pass it back as
+    ?status=<column>&cursor=<cursor>&limit=N to load that column's next cards.
     """
     permission_classes = [IsAuthenticated] 
 
     def get(self, request, *args, **kwargs):
-        # Define the active statuses for the Kanban columns (excluding 'PAID'/'CLOSED')
-        # Ensure these match the JobCard.STATUS_CHOICES keys
-        KANBAN_STATUSES = ['OPEN', 'IN_PROGRESS', 'READY_FOR_PICKUP']
-
-        # Fetch all active job cards, ordered by date_in (check-in date)
-        job_cards = JobCard.objects.filter(
-            status__in=KANBAN_STATUSES
-        ).select_related('client', 'vehicle').order_by('date_in')
-        
-        # Prepare the data structure to group cards by status
-        kanban_data = {status: [] for status in KANBAN_STATUSES}
-        
-        # Manually group and partially serialize the job cards
-        for job_card in job_cards:
-            # We must use string formatting for dates and currency for the frontend
-            card_data = {
-                'id': job_card.id,
-                'job_number': job_card.job_number,
-                'status': job_card.status,
-                'client_name': f"{job_card.client.first_name} {job_card.client.last_name}",
-                'vehicle_license': job_card.vehicle.license_plate,
-                'vehicle_model': f"{job_card.vehicle.make} {job_card.vehicle.model}",
-                # Only display the date part
-                'date_in': job_card.date_in.strftime('%Y-%m-%d') if job_card.date_in else None,
-                'total_due': f"Tsh {job_card.total_due:,.0f}" if job_card.total_due is not None else "Tsh 0",
-            }
-            if job_card.status in kanban_data:
-                kanban_data[job_card.status].append(card_data)
-
-        # Include the list of status keys for the frontend to easily iterate
+        limit = request.query_params.get('limit')
+        if limit is None:
+            # The board is polled; an unchanged board is answered with a bodiless 304
+            return etag_response(
+                request, cache.get_or_set(KANBAN_CACHE_KEY, _build_kanban_board, KANBAN_CACHE_TIMEOUT)
+            )
+
+        try:
+            limit = int(limit)
+        except ValueError:
+            limit = 0
+        if limit < 1:
+            return Response({'error': 'limit must be a positive integer'}, status=status.HTTP_400_BAD_REQUEST)
+        limit = min(limit, KANBAN_MAX_PAGE_SIZE)
+
+        card_status = request.query_params.get('status')
+        cursor = request.query_params.get('cursor')
+        if card_status is not None and card_status not in KANBAN_STATUSES:
+            return Response({'error': 'Invalid status provided'}, status=status.HTTP_400_BAD_REQUEST)
+        if cursor is not None and card_status is None:
+            return Response({'error': 'cursor requires a status'}, status=status.HTTP_400_BAD_REQUEST)
+
+        after = None
+        if cursor is not None:
+            try:
+                after = _decode_kanban_cursor(cursor)
+            except ValueError:
+                return Response({'error': 'Invalid cursor'}, status=status.HTTP_400_BAD_REQUEST)
+
+        # One small indexed query per requested column
+        kanban_data = {}
+        next_cursors = {}
+        for column in ([card_status] if card_status else KANBAN_STATUSES):
+            kanban_data[column], next_cursors[column] = _kanban_column_page(column, limit, after)
+
+        # Column totals (not just this page) in one GROUP BY over the status index
+        counts = dict.fromkeys(KANBAN_STATUSES, 0)
+        counts.update(
+            JobCard.objects.filter(status__in=KANBAN_STATUSES)
+            .values_list('status').annotate(count=Count('id')).order_by()
+        )
+
         return Response({
             'statuses': KANBAN_STATUSES,
             'columns': kanban_data,
-        })
\ No newline at end of file
+            'counts': counts,
+            'next_cursors': next_cursors,
+        })
@@ -6,6 +6,9 @@ import sys
 
 def main():
     """Run administrative tasks."""
+    # The test suite runs with its own settings (fast password hashing)
+    if sys.argv[1:2] == ['test']:
+        os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'garage_ari_project.test_settings')
     os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'garage_ari_project.settings')
     try:
         from django.core.management import execute_from_command_line